@@ -12,11 +12,12 @@ import plotly.graph_objects as go
 import pandas as pd
 import numpy as np
 
-# from pygmo import fast_non_dominated_sorting as nds
 from sklearn import preprocessing
 
+from utils.pareto import non_dominated_sort
 
-data = pd.read_csv("./data/Phone_dataset_new.csv", header=0)
+
+data = pd.read_csv("./data/Phones_2025.csv", header=0)
 details = pd.read_csv("./data/Phone_details.csv", header=0)
 
 names = details.loc[0]
@@ -32,7 +33,8 @@ details_on_card = details.columns[details_on_card == 1]
 
 sort_columns = details.columns[maxi != 0]
 sort_data = data[sort_columns].values * maxi[sort_columns].values
-front = data
+# Only the non-dominated phones are plotted
+front = data[non_dominated_sort(sort_data) == 0].reset_index(drop=True)
 
 numeric_cols = [
     attr
@@ -0,0 +1,119 @@
+/*
+ * Client-side version of the results() callback in main.py.
+ *
+ * Used when the app runs with CLIENTSIDE_RANKING=true: the normalized criteria
+ * matrix and the card data are shipped once in the "ranking-data" store, and
+ * the ranking and result components are computed in the browser, so moving a
+ * slider does not hit the server.
+ */
+
+function htmlComponent(type, props) {
+    return {type: type, namespace: "dash_html_components", props: props};
+}
+
+function dbcComponent(type, props) {
+    return {type: type, namespace: "dash_bootstrap_components", props: props};
+}
+
+/* Row positions of the k phones closest to the aspirations, best first. */
+function topK(store, choices) {
+    var aspirations = choices.map(function (value, j) {
+        var normalized = (value - store.min[j]) / store.range[j];
+        return store.minimize[j] ? 1 - normalized : normalized;
+    });
+    var distance = store.matrix.map(function (row) {
+        var max = 0;
+        for (var j = 0; j < row.length; j++) {
+            max = Math.max(max, Math.abs(row[j] - aspirations[j]));
+        }
+        return max;
+    });
+    var order = distance.map(function (_, i) { return i; });
+    // Earlier Pareto fronts first with PARETO_RANKING (FrontRanking.top_k);
+    // ties are broken by catalogue position, as in RankingEngine.top_k
+    var fronts = store.fronts;
+    order.sort(function (a, b) {
+        return (fronts ? fronts[a] - fronts[b] : 0) ||
+            distance[a] - distance[b] || a - b;
+    });
+    return order.slice(0, store.k);
+}
+
+/* Mirrors table_from_data(): specifications with colour indicators. */
+function bestTable(store, phone, choices) {
+    var rows = store.table_columns.map(function (col, j) {
+        var criterion = store.criteria.indexOf(col);
+        var indicator;
+        if (criterion >= 0) {
+            var diff = phone.criteria[criterion] - choices[criterion];
+            if (store.minimize[criterion]) {
+                diff = -diff;
+            }
+            indicator = htmlComponent("Span", {
+                children: " ▉", style: {color: diff >= 0 ? "green" : "red"}
+            });
+        } else {
+            indicator = htmlComponent("Span", {
+                children: " ", style: {color: "transparent"}
+            });
+        }
+        return htmlComponent("Tr", {children: [
+            htmlComponent("Th", {children: col}),
+            htmlComponent("Td", {children: [phone.table_values[j]]}),
+            htmlComponent("Td", {children: [indicator]})
+        ]});
+    });
+    return dbcComponent("Table", {
+        children: [htmlComponent("Tbody", {children: rows})],
+        style: {fontSize: "1rem"}
+    });
+}
+
+/* Mirrors table_from_data_horizontal(). */
+function tooltipTable(store, phone) {
+    return dbcComponent("Table", {children: [
+        htmlComponent("Thead", {children: htmlComponent("Tr", {
+            children: store.tooltip_columns.map(function (col) {
+                return htmlComponent("Th", {children: col});
+            })
+        })}),
+        htmlComponent("Tbody", {children: [htmlComponent("Tr", {
+            children: phone.tooltip_values.map(function (value) {
+                return htmlComponent("Td", {children: value});
+            })
+        })]})
+    ]});
+}
+
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    ranking: {
+        results: function (memory, ram, battery, cost, store) {
+            if (!store) {
+                throw window.dash_clientside.PreventUpdate;
+            }
+            var choices = [memory, ram, battery, cost];
+            var order = topK(store, choices);
+            var best = store.phones[order[0]];
+
+            var figures = [], names = [], tooltips = [];
+            for (var slot = 2; slot <= store.k; slot++) {
+                var phone = store.phones[order[slot - 1]];
+                if (phone === undefined) {
+                    figures.push(null);
+                    names.push(slot + ". -");
+                    tooltips.push(null);
+                    continue;
+                }
+                figures.push(phone.figure);
+                names.push(slot + ". " + phone.name);
+                tooltips.push(tooltipTable(store, phone));
+            }
+
+            return [
+                bestTable(store, best, choices),
+                best.image,
+                best.name
+            ].concat(figures, names, tooltips);
+        }
+    }
+});
@@ -0,0 +1,61 @@
+/*
+ * Slider update policies for the recommendation callback in main.py.
+ *
+ * Used when SLIDER_UPDATE_MODE is "debounce" or "throttle": the sliders update
+ * on every intermediate value while dragging, and these functions decide when
+ * the values are forwarded to the "<slider>-value" stores that the
+ * recommendation callback listens to. Skipped updates resolve to no_update.
+ */
+
+(function () {
+    var state = {seq: 0, last: 0};
+
+    function skip(values) {
+        return values.map(function () {
+            return window.dash_clientside.no_update;
+        });
+    }
+
+    /* Resolve to the values after `wait` ms, unless a newer call came in. */
+    function deferred(values, wait, onSend) {
+        var seq = ++state.seq;
+        return new Promise(function (resolve) {
+            setTimeout(function () {
+                if (seq === state.seq) {
+                    onSend();
+                    resolve(values);
+                } else {
+                    resolve(skip(values));
+                }
+            }, wait);
+        });
+    }
+
+    window.dash_clientside = Object.assign({}, window.dash_clientside, {
+        update_policy: {
+            /* Forward the values once the sliders have been still for `interval` ms. */
+            debounce: function (memory, ram, battery, cost, interval) {
+                return deferred([memory, ram, battery, cost], interval, function () {});
+            },
+
+            /*
+             * Forward the values at most once every `interval` ms while
+             * dragging; the last values are always forwarded.
+             */
+            throttle: function (memory, ram, battery, cost, interval) {
+                var values = [memory, ram, battery, cost];
+                var now = Date.now();
+                var wait = state.last + interval - now;
+                if (wait <= 0) {
+                    // Invalidate any pending trailing update
+                    state.seq++;
+                    state.last = now;
+                    return values;
+                }
+                return deferred(values, wait, function () {
+                    state.last = Date.now();
+                });
+            }
+        }
+    });
+})();
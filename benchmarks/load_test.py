@@ -0,0 +1,479 @@
+"""
+Load test of the Dash callback endpoint with simulated slider sessions.
+
+Each virtual visitor opens the app page (the ``display_page`` router callback)
+and then moves the preference sliders a few times, sending the ``results``
+callback request the browser would send for every new slider value, including
+the "last-ranking" state returned by the previous response. Slider ranges and
+marks are read from the served layout, so the traces follow the app's real
+slider settings.
+
+Run against a running server::
+
+    python benchmarks/load_test.py --url http://127.0.0.1:8050 --concurrency 8
+
+or let the script start Gunicorn with ``gunicorn.conf.py`` on a free port::
+
+    python benchmarks/load_test.py --serve --concurrency 8 --sessions 200
+
+The report gives p50/p95/p99 latency, throughput and error rate per callback;
+``--output`` also writes it as JSON (with the git commit), to compare runs.
+"""
+
+import argparse
+import http.client
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.parse
+
+from report import git_commit
+
+CALLBACK_PATH = "/_dash-update-component"
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class DashClient:
+    """
+    Minimal HTTP client for a Dash app, with one keep-alive connection.
+
+    Args:
+        url: Base URL of the app
+        timeout: Socket timeout in seconds
+    """
+
+    def __init__(self, url, timeout=30.0):
+        parsed = urllib.parse.urlsplit(url)
+        self.host = parsed.hostname
+        self.port = parsed.port or 80
+        self.prefix = parsed.path.rstrip("/")
+        self.timeout = timeout
+        self._connection = None
+
+    def request(self, method, path, body=None):
+        """
+        Send a request, reconnecting once if the connection was closed.
+
+        Args:
+            method: HTTP method
+            path: Path relative to the app prefix
+            body: JSON-able request body
+
+        Returns:
+            tuple: (status, response body bytes)
+        """
+        data = json.dumps(body).encode() if body is not None else None
+        headers = {"Content-Type": "application/json"} if data else {}
+        for attempt in (0, 1):
+            if self._connection is None:
+                self._connection = http.client.HTTPConnection(
+                    self.host, self.port, timeout=self.timeout
+                )
+            try:
+                self._connection.request(
+                    method, self.prefix + path, body=data, headers=headers
+                )
+                response = self._connection.getresponse()
+                return response.status, response.read()
+            except (http.client.HTTPException, OSError):
+                self._connection.close()
+                self._connection = None
+                if attempt:
+                    raise
+        return None
+
+    def get_json(self, path):
+        status, payload = self.request("GET", path)
+        if status != 200:
+            raise RuntimeError(f"GET {path} returned {status}")
+        return json.loads(payload)
+
+
+def find_components(tree, component_type):
+    """
+    Collect the components of a type from a serialized Dash layout.
+
+    Args:
+        tree: Layout JSON (dicts and lists)
+        component_type: Component type, e.g. "Slider"
+
+    Returns:
+        list: Props of the matching components, in layout order
+    """
+    found = []
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, list):
+            stack.extend(reversed(node))
+        elif isinstance(node, dict):
+            if node.get("type") == component_type and "props" in node:
+                found.append(node["props"])
+            stack.extend(reversed(list(node.values())))
+    return found
+
+
+def slider_values(props):
+    """
+    Values a slider can take, as in utils.slider_grid.slider_values.
+
+    Args:
+        props: Props of a dcc.Slider
+
+    Returns:
+        list: Sorted selectable values
+    """
+    values = {float(mark) for mark in (props.get("marks") or {})}
+    step = props.get("step")
+    if step is not None:
+        value = props["min"]
+        while value <= props["max"]:
+            values.add(float(value))
+            value += step
+    # Whole numbers are sent as integers, as the browser does
+    return [int(v) if v.is_integer() else v for v in sorted(values)]
+
+
+class Scenario:
+    """
+    Request templates of the app, read from a running server.
+
+    Args:
+        client: DashClient connected to the app
+    """
+
+    def __init__(self, client):
+        dependencies = client.get_json("/_dash-dependencies")
+        self.router = next(
+            d for d in dependencies if d["output"].startswith("page-content.")
+        )
+        self.results = next(
+            d for d in dependencies if "results.children" in d["output"]
+        )
+        status, payload = client.request(
+            "POST", CALLBACK_PATH, self.router_body("/app")
+        )
+        if status != 200:
+            raise RuntimeError(f"display_page returned {status}")
+        page = json.loads(payload)
+        # Sliders map to the results inputs in order (the inputs may be the
+        # deferred-update stores rather than the sliders themselves)
+        sliders = find_components(page, "Slider")[: len(self.results["inputs"])]
+        self.sliders = [(slider["value"], slider_values(slider)) for slider in sliders]
+
+    @staticmethod
+    def _outputs(dependency):
+        outputs = []
+        for output in dependency["output"].strip(".").split("..."):
+            component_id, prop = output.rsplit(".", 1)
+            outputs.append({"id": component_id, "property": prop})
+        return outputs
+
+    def router_body(self, pathname):
+        return {
+            "output": self.router["output"],
+            "outputs": self._outputs(self.router)[0],
+            "inputs": [{"id": "url", "property": "pathname", "value": pathname}],
+            "changedPropIds": ["url.pathname"],
+        }
+
+    def results_body(self, values, changed, state):
+        inputs = self.results["inputs"]
+        return {
+            "output": self.results["output"],
+            "outputs": self._outputs(self.results),
+            "inputs": [
+                {"id": i["id"], "property": i["property"], "value": value}
+                for i, value in zip(inputs, values)
+            ],
+            "state": [
+                {"id": s["id"], "property": s["property"], "value": state}
+                for s in self.results.get("state", [])
+            ],
+            "changedPropIds": [
+                f"{inputs[changed]['id']}.{inputs[changed]['property']}"
+            ],
+        }
+
+    def session(self, rng, moves, live):
+        """
+        Generate the slider values of one visit.
+
+        Each move picks a slider and a new value near the current one. With
+        ``live`` every intermediate value is sent, as with
+        ``updatemode="drag"``; otherwise only the released value.
+
+        Args:
+            rng: random.Random instance
+            moves: Number of slider moves
+            live: Whether intermediate values are sent
+
+        Returns:
+            list: (values, index of the changed slider) per request
+        """
+        values = [value for value, _ in self.sliders]
+        trace = []
+        for _ in range(moves):
+            changed = rng.randrange(len(self.sliders))
+            choices = self.sliders[changed][1]
+            current = min(
+                range(len(choices)),
+                key=lambda i: abs(choices[i] - values[changed]),
+            )
+            # Mostly small adjustments, sometimes a long drag
+            distance = max(1, int(rng.expovariate(1 / 2)))
+            target = current + rng.choice((-1, 1)) * distance
+            target = min(max(target, 0), len(choices) - 1)
+            if target == current:
+                continue
+            direction = 1 if target > current else -1
+            path = range(current + direction, target + direction, direction)
+            for index in path if live else [target]:
+                values[changed] = choices[index]
+                trace.append((list(values), changed))
+        return trace
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of a sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(int(round(fraction * len(sorted_values) + 0.5)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+def summarize(samples, elapsed):
+    """
+    Aggregate the samples of one callback.
+
+    Args:
+        samples: (latency in seconds, ok) tuples
+        elapsed: Duration of the run in seconds
+
+    Returns:
+        dict: Counts, error rate, throughput and latency percentiles (ms)
+    """
+    latencies = sorted(latency for latency, _ in samples)
+    errors = sum(1 for _, ok in samples if not ok)
+    summary = {
+        "requests": len(samples),
+        "errors": errors,
+        "error_rate": errors / len(samples) if samples else 0.0,
+        "throughput_rps": len(samples) / elapsed if elapsed else 0.0,
+    }
+    for name, fraction in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99)):
+        value = percentile(latencies, fraction)
+        summary[f"{name}_ms"] = value * 1000 if value is not None else None
+    summary["mean_ms"] = sum(latencies) / len(latencies) * 1000 if latencies else None
+    summary["max_ms"] = latencies[-1] * 1000 if latencies else None
+    return summary
+
+
+def run(url, concurrency, sessions, duration, moves, live, think_time, seed):
+    """
+    Run the load test.
+
+    Args:
+        url: Base URL of the app
+        concurrency: Number of simultaneous visitors
+        sessions: Total number of visits (ignored if ``duration`` is set)
+        duration: Run for this many seconds instead of a number of visits
+        moves: Slider moves per visit
+        live: Send intermediate slider values
+        think_time: Mean pause between requests of a visitor, in seconds
+        seed: Random seed of the traces
+
+    Returns:
+        dict: Report with the configuration and a summary per callback
+    """
+    scenario = Scenario(DashClient(url))
+    samples = {"display_page": [], "results": []}
+    lock = threading.Lock()
+    counter = iter(range(sys.maxsize))
+    deadline = time.perf_counter() + duration if duration else None
+
+    def timed(client, name, body):
+        start = time.perf_counter()
+        try:
+            status, payload = client.request("POST", CALLBACK_PATH, body)
+            ok = status in (200, 204)
+        except (OSError, http.client.HTTPException):
+            payload, ok = None, False
+        latency = time.perf_counter() - start
+        with lock:
+            samples[name].append((latency, ok))
+        return payload if ok else None
+
+    def visitor():
+        client = DashClient(url)
+        while True:
+            with lock:
+                number = next(counter)
+            if deadline is None and number >= sessions:
+                return
+            if deadline is not None and time.perf_counter() >= deadline:
+                return
+            rng = random.Random(seed * 1000003 + number)
+            timed(client, "display_page", scenario.router_body("/app"))
+            state = None
+            for values, changed in scenario.session(rng, moves, live):
+                if think_time:
+                    time.sleep(rng.expovariate(1 / think_time))
+                payload = timed(
+                    client, "results", scenario.results_body(values, changed, state)
+                )
+                if payload:
+                    response = json.loads(payload).get("response", {})
+                    state = response.get("last-ranking", {}).get("data", state)
+
+    threads = [threading.Thread(target=visitor) for _ in range(concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    all_samples = samples["display_page"] + samples["results"]
+    return {
+        "commit": git_commit(),
+        "config": {
+            "url": url,
+            "concurrency": concurrency,
+            "sessions": None if duration else sessions,
+            "duration": duration,
+            "moves": moves,
+            "live": live,
+            "think_time": think_time,
+            "seed": seed,
+        },
+        "elapsed_s": elapsed,
+        "callbacks": {name: summarize(s, elapsed) for name, s in samples.items()},
+        "total": summarize(all_samples, elapsed),
+    }
+
+
+def start_server(env_overrides, timeout=60.0):
+    """
+    Start Gunicorn with gunicorn.conf.py on a free port and wait until ready.
+
+    Args:
+        env_overrides: Extra environment variables (e.g. WORKERS)
+        timeout: Seconds to wait for /readyz
+
+    Returns:
+        tuple: (subprocess.Popen, base URL)
+    """
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    env = dict(os.environ, PORT=str(port), **env_overrides)
+    process = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "--config", "gunicorn.conf.py"]
+        + ["wsgi:application"],
+        cwd=ROOT,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    url = f"http://127.0.0.1:{port}"
+    client = DashClient(url, timeout=2.0)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("Gunicorn exited during startup")
+        try:
+            if client.request("GET", "/readyz")[0] == 200:
+                return process, url
+        except OSError:
+            pass
+        time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError(f"Server not ready after {timeout}s")
+
+
+def format_report(report):
+    lines = [
+        f"commit {report['commit']}, {report['elapsed_s']:.1f}s, "
+        f"concurrency {report['config']['concurrency']}"
+    ]
+    lines.append(
+        f"{'callback':<14}{'requests':>9}{'errors':>8}{'rps':>9}"
+        f"{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+    )
+    rows = dict(report["callbacks"], total=report["total"])
+    for name, s in rows.items():
+        if not s["requests"]:
+            continue
+        lines.append(
+            f"{name:<14}{s['requests']:>9}{s['errors']:>8}{s['throughput_rps']:>9.1f}"
+            f"{s['p50_ms']:>9.1f}{s['p95_ms']:>9.1f}{s['p99_ms']:>9.1f}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--url", default="http://127.0.0.1:8050")
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="start Gunicorn on a free port instead of using --url",
+    )
+    parser.add_argument(
+        "--env",
+        action="append",
+        default=[],
+        metavar="NAME=VALUE",
+        help="environment variable for the --serve server (repeatable)",
+    )
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--sessions", type=int, default=100)
+    parser.add_argument("--duration", type=float, help="seconds; overrides --sessions")
+    parser.add_argument("--moves", type=int, default=8, help="slider moves per visit")
+    parser.add_argument(
+        "--live",
+        action="store_true",
+        help="send every intermediate value while dragging (updatemode=drag)",
+    )
+    parser.add_argument(
+        "--think-time", type=float, default=0.0, help="mean pause in seconds"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the report as JSON to this file")
+    args = parser.parse_args(argv)
+
+    process = None
+    url = args.url
+    if args.serve:
+        overrides = dict(item.split("=", 1) for item in args.env)
+        process, url = start_server(overrides)
+    try:
+        report = run(
+            url,
+            args.concurrency,
+            args.sessions,
+            args.duration,
+            args.moves,
+            args.live,
+            args.think_time,
+            args.seed,
+        )
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+    print(format_report(report))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
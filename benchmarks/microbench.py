@@ -0,0 +1,203 @@
+"""
+Microbenchmarks of the steps behind the recommendation callback.
+
+Each step of ``main.results`` is timed on its own, on synthetic catalogues of
+increasing size, to show which steps grow with the catalogue:
+
+- normalization: building the RankingEngine matrix (once per catalogue load)
+- distance: Chebyshev distance from the aspirations to every phone
+- ordering: selecting the best phones (top-k) and, for comparison, sorting all
+- top-k: the whole ranking query, by brute force and with the KD-tree index
+  (utils.spatial_index), whose build is timed as well, and layered by Pareto
+  front (utils.pareto) after sorting the first fronts
+- fragments: building the card components of every phone (the app builds
+  them per ranked phone; only the clientside ranking data needs them all)
+- table_from_data: best-phone table for the aspirations
+- other_options: names, tooltips and images of the alternatives
+- serialization: Dash JSON encoding of the callback outputs
+
+Steps that only touch the shown phones are expected to stay flat. Building the
+fragments of every phone is limited to ``--fragment-limit`` rows, beyond which
+it would dominate the run; the per-request steps use the fragments of the
+ranked phones only.
+
+Catalogues come from utils.synthetic_catalogue, fitted to the app's catalogue.
+Timings follow pytest-benchmark: after a warm-up call, each round runs the
+step enough times to last ``--min-time``, and rounds repeat until
+``--max-time``. Run from the repository root::
+
+    python benchmarks/microbench.py --sizes 25 1000 100000 1000000
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+import main  # noqa: E402
+from dash._utils import to_json  # noqa: E402
+from report import git_commit  # noqa: E402
+from utils.pareto import FrontRanking  # noqa: E402
+from utils.ranking import RankingEngine, top_k_from_distances  # noqa: E402
+from utils.spatial_index import IndexedRankingEngine  # noqa: E402
+from utils.synthetic_catalogue import synthetic_catalogue  # noqa: E402
+
+DEFAULT_SIZES = (25, 1_000, 100_000, 1_000_000)
+
+
+def measure(func, min_time, max_time, min_rounds=5):
+    """
+    Time a function in the style of pytest-benchmark.
+
+    Args:
+        func: Function without arguments
+        min_time: Minimum duration of a round, in seconds
+        max_time: Target total duration, in seconds
+        min_rounds: Minimum number of rounds
+
+    Returns:
+        dict: Per-call min, median, mean and standard deviation in seconds,
+        with the number of rounds and calls per round
+    """
+    start = time.perf_counter()
+    func()
+    once = time.perf_counter() - start
+    iterations = max(1, int(min_time / once)) if once < min_time else 1
+    times = []
+    deadline = time.perf_counter() + max_time
+    while len(times) < min_rounds or time.perf_counter() < deadline:
+        start = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        times.append((time.perf_counter() - start) / iterations)
+        if once > max_time and len(times) >= 1:
+            # Slow steps: one round is enough to see the scaling
+            break
+    return {
+        "min": min(times),
+        "median": statistics.median(times),
+        "mean": statistics.fmean(times),
+        "stddev": statistics.stdev(times) if len(times) > 1 else 0.0,
+        "rounds": len(times),
+        "iterations": iterations,
+    }
+
+
+def benchmark_size(size, args):
+    """
+    Run every step on a synthetic catalogue of one size.
+
+    Args:
+        size: Number of phones
+        args: Parsed command line options
+
+    Returns:
+        dict: Timings per step
+    """
+    catalogue = synthetic_catalogue(
+        size,
+        args.seed,
+        main.catalogue_paths["data_path"],
+        main.catalogue_paths["details_path"],
+    )
+    data = catalogue.data
+    choices = [main.slider_settings[slider]["value"] for slider in main.slider_settings]
+    k = main.RESULTS_COUNT
+    card_data = data[list(catalogue.on_card) + ["Id"]].reset_index(drop=True)
+
+    def timed(func):
+        return measure(func, args.min_time, args.max_time)
+
+    timings = {}
+    timings["normalization"] = timed(
+        lambda: RankingEngine.from_frame(data, main.fitness_columns)
+    )
+    engine = RankingEngine.from_frame(data, main.fitness_columns)
+    timings["distance"] = timed(lambda: engine.distances(choices))
+    distance = engine.distances(choices)
+    timings["ordering (top-k)"] = timed(lambda: top_k_from_distances(distance, k))
+    timings["ordering (full sort)"] = timed(lambda: np.argsort(distance, kind="stable"))
+    timings["top-k (brute force)"] = timed(lambda: engine.top_k(choices, k))
+    timings["KD-tree build"] = timed(
+        lambda: IndexedRankingEngine.from_frame(data, main.fitness_columns)
+    )
+    indexed = IndexedRankingEngine.from_frame(data, main.fitness_columns)
+    timings["top-k (KD-tree)"] = timed(lambda: indexed.top_k(choices, k))
+    timings["Pareto fronts"] = timed(lambda: FrontRanking(engine, k))
+    layered = FrontRanking(engine, k)
+    timings["top-k (Pareto fronts)"] = timed(lambda: layered.top_k(choices, k))
+
+    if size <= args.fragment_limit:
+        timings["fragments"] = timed(lambda: main.build_phone_fragments(card_data))
+    order = engine.top_k(choices, k)
+    ranked = main.build_phone_fragments(card_data.iloc[order].reset_index(drop=True))
+
+    timings["table_from_data"] = timed(lambda: main.table_from_data(ranked[0], choices))
+    timings["other_options"] = timed(lambda: main.other_options(ranked[1:]))
+    best = main.table_from_data(ranked[0], choices)
+    others, tooltips, figures = main.other_options(ranked[1:])
+    outputs = [best, ranked[0].image, ranked[0].name, *figures, *others, *tooltips]
+    timings["serialization"] = timed(lambda: to_json(outputs))
+    return timings
+
+
+def format_seconds(seconds):
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("µs", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3g} {unit}"
+    return f"{seconds / 1e-9:.3g} ns"
+
+
+def format_report(report):
+    sizes = list(report["sizes"])
+    steps = list(dict.fromkeys(step for s in sizes for step in report["sizes"][s]))
+    width = max(len(step) for step in steps) + 2
+    lines = [
+        "median time per call; commit " + str(report["commit"]),
+        "step".ljust(width) + "".join(f"{size:>12}" for size in sizes),
+    ]
+    for step in steps:
+        cells = []
+        for size in sizes:
+            timing = report["sizes"][size].get(step)
+            cells.append(format_seconds(timing["median"]) if timing else "-")
+        lines.append(step.ljust(width) + "".join(f"{cell:>12}" for cell in cells))
+    return "\n".join(lines)
+
+
+def main_cli(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument(
+        "--fragment-limit",
+        type=int,
+        default=1_000,
+        help="largest catalogue whose fragments are all built",
+    )
+    parser.add_argument("--min-time", type=float, default=0.005)
+    parser.add_argument("--max-time", type=float, default=0.5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the timings as JSON to this file")
+    args = parser.parse_args(argv)
+
+    report = {"commit": git_commit(), "sizes": {}}
+    for size in args.sizes:
+        report["sizes"][size] = benchmark_size(size, args)
+        print(f"{size} phones done", file=sys.stderr)
+
+    print(format_report(report))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,102 @@
+"""
+Gunicorn configuration for the production server.
+
+Used by ``wsgi.py`` (``python wsgi.py``) and by the container image
+(``gunicorn --config gunicorn.conf.py wsgi:application``). Every setting can be
+overridden per deployment with an environment variable:
+
+- PORT: port to listen on (default: 8050)
+- WORKERS: number of worker processes (default: 2)
+- THREADS: threads per worker; more than 1 uses the gthread worker (default: 4)
+- TIMEOUT: seconds before a silent worker is killed and restarted (default: 120)
+- GRACEFUL_TIMEOUT: seconds workers get to finish requests on restart (default: 30)
+- KEEPALIVE: seconds to keep idle connections open (default: 5)
+- MAX_REQUESTS: recycle a worker after this many requests, 0 to disable (default: 0)
+- PRELOAD: load the app and dataset in the master before forking, so the
+  workers share those pages copy-on-write (default: true)
+- MEMORY_REPORT_INTERVAL: seconds between worker memory log lines, 0 to log
+  only at startup (default: 0)
+
+Send SIGHUP to the master for a graceful reload: new workers are started and
+old ones finish their requests before exiting. With PRELOAD=true the new
+workers are forked from the already loaded app, so code or data changes need a
+full restart (or the catalogue hot reload).
+"""
+
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 8050)}"
+workers = int(os.environ.get("WORKERS", 2))
+threads = int(os.environ.get("THREADS", 4))
+worker_class = "gthread" if threads > 1 else "sync"
+timeout = int(os.environ.get("TIMEOUT", 120))
+graceful_timeout = int(os.environ.get("GRACEFUL_TIMEOUT", 30))
+keepalive = int(os.environ.get("KEEPALIVE", 5))
+max_requests = int(os.environ.get("MAX_REQUESTS", 0))
+max_requests_jitter = max_requests // 10
+preload_app = os.environ.get("PRELOAD", "True").lower() == "true"
+
+# Heartbeat files in memory rather than on the container's overlay filesystem
+worker_tmp_dir = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+accesslog = "-"
+errorlog = "-"
+loglevel = "debug" if os.environ.get("DEBUG", "False").lower() == "true" else "info"
+
+# Log the memory of each worker every MEMORY_REPORT_INTERVAL seconds (0: only
+# once, when the worker starts)
+memory_report_interval = float(os.environ.get("MEMORY_REPORT_INTERVAL", 0))
+
+
+def on_starting(server):
+    """
+    Drop the metrics left in METRICS_DIR by the workers of a previous run.
+    """
+    if os.environ.get("METRICS_DIR"):
+        from utils.metrics import clear_snapshots
+
+        clear_snapshots(os.environ["METRICS_DIR"])
+
+
+def when_ready(server):
+    """
+    Warm up the preloaded app and freeze its heap before the workers are forked.
+    """
+    from utils.memory import format_memory, freeze_heap, process_memory
+
+    if server.cfg.preload_app:
+        import main
+
+        main.warm_up()
+        freeze_heap()
+    server.log.info("Master memory: %s", format_memory(process_memory()))
+
+
+def post_worker_init(worker):
+    """
+    Warm up the app if it was not preloaded, then log the worker's memory
+    usage, and keep logging it if configured.
+    """
+    import threading
+
+    from utils.memory import format_memory, process_memory
+
+    if not worker.cfg.preload_app:
+        import main
+
+        main.warm_up()
+
+    def report():
+        worker.log.info(
+            "Worker %s memory: %s", worker.pid, format_memory(process_memory())
+        )
+
+    report()
+    if memory_report_interval > 0:
+        stop = threading.Event()
+
+        def report_periodically():
+            while not stop.wait(memory_report_interval):
+                report()
+
+        threading.Thread(target=report_periodically, daemon=True).start()
@@ -21,7 +21,18 @@ Dependencies:
 - plotly: Visualization components
 """
 
-from dash import Dash, dcc, html, Input, Output, callback
+import functools
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+# Imported first, so that STARTUP_AUDIT=true times the imports below
+from utils.startup_audit import startup_audit
+
+from dash import Dash, dcc, html, Input, Output, State, callback, ClientsideFunction
+from dash import no_update
 
 import dash_bootstrap_components as dbc
 import pandas as pd
@@ -29,25 +40,29 @@ import numpy as np
 
 from flask import Response
 
-# Data Loading and Preprocessing
-# Load the main phone dataset and details configuration
-data = pd.read_csv("./data/Phones_2025.csv", header=0)
-details = pd.read_csv("./data/Phone_details.csv", header=0)
-
-# Extract column names from the first row of details file
-names = details.loc[0]
-
-# Rename columns in both datasets using the extracted names
-data = data.rename(columns=names)
-details = details.rename(columns=names)
-
-# Extract maximum values for normalization (row 1 of details)
-maxi = details.loc[1].astype(int)
+from utils.asset_fingerprints import AssetFingerprints
+from utils.catalogue import COMPILED_FILE, CatalogueWatcher, load_catalogue
+from utils.image_derivatives import available_variants, build_derivatives
+from utils.metrics import CallbackMetrics
+from utils.pareto import FrontRanking
+from utils.precompress import PrecompressedFiles
+from utils.result_cache import ResultCache, create_backend
+from utils.slider_grid import SliderGrid
+from utils.spatial_index import IndexedRankingEngine, ranking_engine
 
-# Extract flags for which details should be displayed on cards (row 2 of details)
-details_on_card = details.loc[2].astype(int)
-print(details_on_card)
-details_on_card = details.columns[details_on_card == 1]
+# Data Loading and Preprocessing
+# The main phone dataset and the metadata of its columns (display names,
+# normalization values and on-card flags, from Phone_details.csv) are loaded on
+# first use or by warm_up(). The compiled catalogue at CATALOGUE_FILE
+# (python -m utils.catalogue) is memory-mapped when it is up to date with the
+# CSV files, which are parsed otherwise. CATALOGUE_DATA and CATALOGUE_DETAILS
+# replace the CSV files, e.g. with a synthetic catalogue for scale tests
+# (python -m utils.synthetic_catalogue).
+catalogue_paths = {
+    "data_path": os.environ.get("CATALOGUE_DATA", "./data/Phones_2025.csv"),
+    "details_path": os.environ.get("CATALOGUE_DETAILS", "./data/Phone_details.csv"),
+    "compiled_path": os.environ.get("CATALOGUE_FILE", COMPILED_FILE),
+}
 
 
 # Multi-Criteria Decision Analysis Configuration
@@ -61,13 +76,319 @@ fitness_columns = {
     "Price (Euros)": 1,  # Lower price is better
 }
 
-# Normalize fitness data using maximum values for proper comparison
-fitness_data = (
-    data[list(fitness_columns.keys())] * maxi[list(fitness_columns.keys())].values
+# Preference sliders, in the same order as the criteria in fitness_columns.
+# With step=None only the marks can be selected.
+slider_settings = {
+    "memory-choice": {
+        "min": 128,
+        "max": 1024,
+        "step": None,
+        "value": 256,
+        "marks": {128: "128", 256: "256", 512: "512", 1024: "1024"},
+    },
+    "ram-choice": {
+        "min": 4,
+        "max": 24,
+        "step": None,
+        "value": 8,
+        "marks": {4: "4", 6: "6", 8: "8", 10: "10", 12: "12", 24: "24"},
+    },
+    "cam-choice": {
+        "min": 4000,
+        "max": 7000,
+        "step": 100,
+        "value": 5000,
+        "marks": {value: str(value) for value in range(4000, 7001, 500)},
+    },
+    "cost-choice": {
+        "min": 50,
+        "max": 2000,
+        "step": 50,
+        "value": 600,
+        "marks": {value: str(value) for value in [50, *range(200, 2001, 200)]},
+    },
+}
+
+# When the recommendations are updated while a slider is moved
+# SLIDER_UPDATE_MODE:
+#   "release"  - only when the slider is released (default)
+#   "live"     - on every intermediate value while dragging
+#   "debounce" - once the slider has been still for SLIDER_UPDATE_MS
+#   "throttle" - while dragging, at most once every SLIDER_UPDATE_MS
+SLIDER_UPDATE_MODE = os.environ.get("SLIDER_UPDATE_MODE", "release").lower()
+SLIDER_UPDATE_MS = int(os.environ.get("SLIDER_UPDATE_MS", 300))
+if SLIDER_UPDATE_MODE not in ("release", "live", "debounce", "throttle"):
+    raise ValueError(f"Unknown SLIDER_UPDATE_MODE: {SLIDER_UPDATE_MODE!r}")
+slider_updatemode = "mouseup" if SLIDER_UPDATE_MODE == "release" else "drag"
+
+# With debounce/throttle the sliders feed "<slider>-value" stores through the
+# "update_policy" clientside callback (assets/update_policy.js), and the
+# recommendation callback listens to the stores instead of the sliders
+DEFERRED_UPDATES = SLIDER_UPDATE_MODE in ("debounce", "throttle")
+preference_sources = {
+    slider: f"{slider}-value" if DEFERRED_UPDATES else slider
+    for slider in slider_settings
+}
+
+# Number of phones shown: the best match plus the alternatives
+RESULTS_COUNT = 5
+
+# Optional lookup table with the top phones for every slider combination
+# (enabled with PRECOMPUTE_GRID=true); results() then does no ranking work
+PRECOMPUTE_GRID = os.environ.get("PRECOMPUTE_GRID", "False").lower() == "true"
+
+# Memoization of recommend() keyed on the rounded slider values
+# RESULTS_CACHE_BACKEND: "memory" (per-process LRU), or "filesystem"/"sqlite" to
+# share results between the workers of a host (stored at RESULTS_CACHE_PATH)
+# RESULTS_CACHE_SIZE: maximum number of entries (0 disables caching)
+# RESULTS_CACHE_TTL: seconds an entry stays valid (0 for no expiry)
+results_cache_size = int(os.environ.get("RESULTS_CACHE_SIZE", 1024))
+results_cache = ResultCache(
+    maxsize=results_cache_size,
+    backend=create_backend(
+        os.environ.get("RESULTS_CACHE_BACKEND", "memory"),
+        path=os.environ.get("RESULTS_CACHE_PATH"),
+        maxsize=results_cache_size,
+        ttl=float(os.environ.get("RESULTS_CACHE_TTL", 0)),
+    ),
 )
 
+
+# Rank in the browser instead of on the server (CLIENTSIDE_RANKING=true): the
+# normalized criteria and card data ship once in a dcc.Store and the
+# "ranking.results" clientside callback (assets/clientside_ranking.js) does the rest
+CLIENTSIDE_RANKING = os.environ.get("CLIENTSIDE_RANKING", "False").lower() == "true"
+
+# Ranking backend (RANKING_BACKEND): "brute" scans every phone, "tree" queries a
+# Chebyshev KD-tree, "auto" uses the tree from RANKING_INDEX_THRESHOLD phones on
+# (measured at startup when unset, see utils.spatial_index)
+RANKING_BACKEND = os.environ.get("RANKING_BACKEND", "auto").lower()
+RANKING_INDEX_THRESHOLD = (
+    int(os.environ["RANKING_INDEX_THRESHOLD"])
+    if os.environ.get("RANKING_INDEX_THRESHOLD")
+    else None
+)
+
+# Prefer Pareto-optimal phones (PARETO_RANKING=true): results are ordered by
+# Pareto front, then by distance to the preferences, so dominated phones are
+# only shown when the non-dominated ones do not fill the results
+PARETO_RANKING = os.environ.get("PARETO_RANKING", "False").lower() == "true"
+
+# Version of the code that builds the results: a hash of the application
+# sources, so workers running another release never share cached results
+_app_directory = os.path.dirname(os.path.abspath(__file__))
+CODE_VERSION = hashlib.sha1(
+    b"".join(
+        open(os.path.join(_app_directory, path), "rb").read()
+        for path in ["main.py"]
+        + sorted(
+            os.path.join("utils", name)
+            for name in os.listdir(os.path.join(_app_directory, "utils"))
+            if name.endswith(".py")
+        )
+    )
+).hexdigest()[:12]
+
+
+# Reload the catalogue when its files change, checking every
+# CATALOGUE_RELOAD_INTERVAL seconds (0 disables reloading)
+CATALOGUE_RELOAD_INTERVAL = float(os.environ.get("CATALOGUE_RELOAD_INTERVAL", 0))
+
+
+class RankingStructures:
+    """
+    Everything derived from a loaded catalogue.
+
+    Requests read the current instance once and use only that instance, so a
+    reload that swaps in a new one never mixes two catalogue versions.
+
+    Args:
+        catalogue: Loaded Catalogue
+    """
+
+    def __init__(self, catalogue):
+        self.catalogue = catalogue
+        data = catalogue.data
+
+        # Ranking engine: criteria matrix normalized and direction-flipped once,
+        # so each callback only normalizes the aspiration vector; large
+        # catalogues are also indexed in a KD-tree
+        self.engine = ranking_engine(
+            data, fitness_columns, RANKING_BACKEND, RANKING_INDEX_THRESHOLD
+        )
+        if isinstance(self.engine, IndexedRankingEngine):
+            print(f"Ranking {len(self.engine)} phones with a KD-tree")
+
+        # Ranking used by the callbacks: the engine, or the engine restricted
+        # to the first Pareto fronts (precomputed once per catalogue)
+        self.ranker = self.engine
+        if PARETO_RANKING:
+            self.ranker = FrontRanking(self.engine, RESULTS_COUNT)
+            print(
+                f"Pareto ranking: {len(self.ranker.positions)} phones in the "
+                f"first {self.ranker.layers.max(initial=-1) + 1} fronts"
+            )
+
+        self.grid = None
+        if PRECOMPUTE_GRID:
+            self.grid = SliderGrid.from_sliders(
+                self.ranker, slider_settings, RESULTS_COUNT
+            )
+            print(
+                f"Slider grid: {self.grid.combinations} combinations, "
+                f"{self.grid.nbytes / 1024:.1f} KiB ({self.grid.table.dtype})"
+            )
+
+        # Data shown on the result cards (include Id for image mapping)
+        self.card_data = data[list(catalogue.on_card) + ["Id"]].reset_index(drop=True)
+
+        # Result components of the ranked phones, built on first use
+        self.fragments = FragmentCache(self.card_data)
+        self.clientside_data = (
+            build_clientside_data(self) if CLIENTSIDE_RANKING else None
+        )
+
+        self.fingerprint = hashlib.sha1(
+            pd.util.hash_pandas_object(data, index=True).values.tobytes()
+        ).hexdigest()[:16]
+        # Result cache entries are namespaced by the catalogue, the code and the
+        # settings that change the results, so a shared store never serves
+        # results computed by a worker with another version or configuration
+        self.cache_namespace = (
+            f"{self.fingerprint}-{CODE_VERSION}"
+            f"-k{RESULTS_COUNT}-pareto{int(PARETO_RANKING)}"
+        )
+
+
+# Current RankingStructures, built on first use (see current_structures)
+ranking_structures = None
+_structures_lock = threading.Lock()
+
+
+def current_structures():
+    """
+    Return the current ranking structures, loading the catalogue on first use.
+
+    Returns:
+        RankingStructures: Structures of the current catalogue
+    """
+    structures = ranking_structures
+    if structures is None:
+        with _structures_lock:
+            if ranking_structures is None:
+                with startup_audit.phase("catalogue and ranking structures"):
+                    catalogue = load_catalogue(**catalogue_paths)
+                    print(f"Loaded {len(catalogue)} phones from {catalogue.source}")
+                    build_ranking_structures(catalogue)
+            structures = ranking_structures
+    return structures
+
+
+def build_ranking_structures(catalogue):
+    """
+    Build the ranking structures of a catalogue and make them current.
+
+    The new structures replace the previous ones in a single assignment, then
+    the result cache switches to the new catalogue's namespace.
+
+    Args:
+        catalogue: Loaded Catalogue
+
+    Returns:
+        RankingStructures: The new current structures
+    """
+    global ranking_structures
+
+    structures = RankingStructures(catalogue)
+    ranking_structures = structures
+    results_cache.switch_namespace(structures.cache_namespace)
+    return structures
+
+
+def reload_catalogue():
+    """
+    Load the catalogue files again and swap in the rebuilt ranking structures.
+
+    Runs on the catalogue watcher thread; requests keep using the previous
+    structures until the new ones are complete.
+    """
+    with _structures_lock:
+        catalogue = load_catalogue(**catalogue_paths)
+        structures = build_ranking_structures(catalogue)
+    print(
+        f"Reloaded {len(catalogue)} phones from {catalogue.source} "
+        f"(catalogue {structures.fingerprint})"
+    )
+
+
+def build_clientside_data(structures):
+    """
+    Collect what the clientside ranking callback needs into a JSON-able dict.
+
+    Args:
+        structures: RankingStructures being built
+
+    Returns:
+        dict: Normalized criteria matrix and scaling, plus per-phone card data
+        and image components
+    """
+    card_data = structures.card_data
+    engine = structures.engine
+    table_columns = [col for col in card_data.columns if col not in hidden_fields]
+    tooltip_columns = [col for col in card_data.columns if col != "Id"]
+    criteria = list(fitness_columns)
+    phones = [
+        {
+            "name": fragments.name,
+            # Prebuilt image components, serialized with the store
+            "image": fragments.image,
+            "figure": fragments.figure,
+            "criteria": [_to_json(row[col]) for col in criteria],
+            "table_values": [str(row[col]) for col in table_columns],
+            "tooltip_values": [_to_json(row[col]) for col in tooltip_columns],
+        }
+        for row, fragments in zip(
+            card_data.to_dict("records"), build_phone_fragments(card_data)
+        )
+    ]
+    return {
+        "k": RESULTS_COUNT,
+        "matrix": engine.matrix.tolist(),
+        "min": engine.data_min.tolist(),
+        "range": engine.data_range.tolist(),
+        "minimize": engine.minimize.tolist(),
+        # Pareto front per phone with PARETO_RANKING, ranked before the distance
+        "fronts": structures.ranker.fronts.tolist() if PARETO_RANKING else None,
+        "criteria": criteria,
+        "table_columns": table_columns,
+        "tooltip_columns": tooltip_columns,
+        "phones": phones,
+    }
+
+
+def _to_json(value):
+    """Convert NumPy scalars to plain Python values."""
+    return value.item() if isinstance(value, np.generic) else value
+
+
+# Criteria that can be compared to user preferences
+comparable_criteria = list(fitness_columns)
+
+# Fields of the card data hidden from the best-phone table
+hidden_fields = [
+    "Id",
+    "Brand",
+    "Model",
+    "Release Date",
+    "Release_Date",
+    "brand",
+    "model",
+    "release_date",
+]
+
+
 # Application assets
-PLOTLY_LOGO = "assets/logo.png"
+PLOTLY_LOGO = "logo.png"
 
 # external_stylesheets = ["https://codepen.io/chriddyp/pen/bWLwgP.css"]
 
@@ -82,6 +403,71 @@ app = Dash(
 # Expose Flask server for Gunicorn compatibility (if needed)
 server = app.server
 
+# Content-hashed asset URLs; responses for them get long-lived cache headers
+asset_fingerprints = AssetFingerprints(app.config.assets_folder)
+asset_fingerprints.install(app)
+
+# Latency of the Dash callbacks by phase, request counts, response sizes and
+# result cache counters, served at /metrics in the Prometheus text format.
+# With METRICS_DIR set, the workers share their values through that folder and
+# every scrape reports the whole pod.
+callback_metrics = CallbackMetrics(directory=os.environ.get("METRICS_DIR"))
+callback_metrics.registry.define(
+    "results_cache_hits_total", "counter", "Result cache lookups that hit"
+)
+callback_metrics.registry.define(
+    "results_cache_misses_total", "counter", "Result cache lookups that missed"
+)
+callback_metrics.registry.define(
+    "results_cache_hit_ratio",
+    "gauge",
+    "Share of the result cache lookups that hit",
+    ratio=("results_cache_hits_total", "results_cache_misses_total"),
+)
+
+
+def collect_cache_metrics(registry):
+    """
+    Copy the result cache counters into the metrics registry.
+
+    Args:
+        registry: MetricsRegistry of the app
+    """
+    registry.set("results_cache_hits_total", results_cache.hits)
+    registry.set("results_cache_misses_total", results_cache.misses)
+
+
+callback_metrics.collectors.append(collect_cache_metrics)
+callback_metrics.install(app)
+
+
+# Gzip/brotli variants of the static files, built with `python -m utils.precompress`
+# into PRECOMPRESSED_FOLDER and served according to the request's Accept-Encoding
+precompressed_folder = os.environ.get(
+    "PRECOMPRESSED_FOLDER", os.path.join("build", "precompressed")
+)
+if os.path.isdir(precompressed_folder):
+    PrecompressedFiles(precompressed_folder, app.config.assets_folder).install(app)
+
+# Resized/WebP variants of the phone images: built offline with
+# `python -m utils.image_derivatives`, and brought up to date by warm_up() unless
+# IMAGE_DERIVATIVES=false (skipped if Pillow is missing or assets are read-only)
+IMAGE_DERIVATIVES = os.environ.get("IMAGE_DERIVATIVES", "True").lower() == "true"
+
+
+def asset_url(path):
+    """
+    Return the fingerprinted URL of a file in the assets folder.
+
+    Args:
+        path: Path relative to the assets folder
+
+    Returns:
+        str: URL that changes only when the file content changes
+    """
+    return asset_fingerprints.url(app, path)
+
+
 # Main application layout with URL routing
 app.layout = html.Div(
     [dcc.Location(id="url", refresh=False), html.Div(id="page-content")]
@@ -90,445 +476,445 @@ app.layout = html.Div(
 
 # Home Page Layout
 # Landing page with introduction and call-to-action button
-home_page = html.Div(
-    style={"backgroundColor": "#002957", "overflow": "hidden"},  # Dark blue background
-    children=[
-        dbc.Row(
-            [
-                dbc.Col(
-                    children=[
-                        dbc.Row(
-                            [
-                                dbc.Col(
-                                    children=[
-                                        html.H1(
-                                            children="Find your optimal phone",
-                                            className="main-title",
-                                        ),
-                                        html.P(
-                                            (
-                                                "This app uses decision support tools to "
-                                                "quickly and easily find phones which reflect "
-                                                "the user's desires. You only need to input your preferences "
-                                                "and the app will show you the phone "
-                                                "which matches the preferences the best. "
-                                                "In case you do not like the suggested phone, "
-                                                "the app also shows you some alternatives close to your preferences."
-                                            ),
-                                            className="main-p",
-                                        ),
-                                        html.Div(
-                                            children=[
-                                                dcc.Link(
-                                                    dbc.Button(
-                                                        "START",
-                                                        color="primary",
-                                                        className="start-button",
-                                                    ),
-                                                    href="/app",
-                                                    refresh=True,
-                                                ),
-                                                # dbc.Button("START", color="primary", className="start-button")
-                                            ],
-                                            className="start-button-div",
-                                        ),
-                                    ],
-                                    width=6,
-                                    className="main-col-text",
-                                ),
-                                dbc.Col(
-                                    children=[
-                                        # html.P("Example")
-                                        html.Img(
-                                            src=r"assets/home_screen.png",
-                                            alt="image",
-                                            className="main_figure",
-                                        )
-                                    ],
-                                    width=6,
-                                    className="figure-main",
-                                ),
-                            ],
-                            className="row-main",
-                        )
-                    ]
-                )
-            ],
-            className="g-0 row-main",
-        ),
-    ],
-)
+@functools.cache
+def home_page():
+    """
+    Build the landing page layout on first use.
 
-# Main Application Page Layout
-# Interactive phone selection interface with preferences form and results display
-app_page = html.Div(
-    children=[
-        dbc.Navbar(
-            dbc.Container(
+    Returns:
+        html.Div: Introduction and call-to-action button
+    """
+    return html.Div(
+        # Dark blue background
+        style={"backgroundColor": "#002957", "overflow": "hidden"},
+        children=[
+            dbc.Row(
                 [
-                    html.A(
-                        # Use row and col to control vertical alignment of logo / brand
-                        dbc.Row(
-                            [
-                                dbc.Col(
-                                    html.Img(src=PLOTLY_LOGO, height="30px"),
-                                    width="auto",
-                                ),
-                                dbc.Col(
-                                    dbc.NavbarBrand(
-                                        "Multiobjective Optimization Group - Phone selection tool",
-                                        className="ms-2",
-                                    )
-                                ),
-                            ],
-                            align="center",
-                            className="g-0",
-                        ),
-                        href="/",
-                        style={"textDecoration": "none"},
-                    ),
-                    dbc.NavbarToggler(id="navbar-toggler", n_clicks=0),
-                ],
-                fluid=True,
-            ),
-            color="#002957",
-            dark=True,
-        ),
-        dbc.Row(
-            children=[
-                dbc.Col(
-                    children=[
-                        # Top card with details(?)
-                        dbc.Card(
-                            children=[
-                                dbc.CardHeader(
-                                    "Your preferences",
-                                    className="card-header",
-                                ),
-                                dbc.CardBody(
-                                    [
-                                        html.P(
-                                            (
-                                                "INSTRUCTIONS: Input your preferences "
-                                                "below. The box on top right shows the phone "
-                                                "which matches the preferences the best. "
-                                                "The box on bottom right provides some "
-                                                "close alternatives."
+                    dbc.Col(
+                        children=[
+                            dbc.Row(
+                                [
+                                    dbc.Col(
+                                        children=[
+                                            html.H1(
+                                                children="Find your optimal phone",
+                                                className="main-title",
                                             ),
-                                            className="card-text",
-                                        ),
-                                        dbc.Form(
-                                            [
-                                                dbc.Row(
-                                                    children=[
-                                                        dbc.Label(
-                                                            [
-                                                                html.Span(
-                                                                    "💾 ",
-                                                                    style={
-                                                                        "fontSize": "1.2em",
-                                                                        "marginRight": "8px",
-                                                                    },
-                                                                ),
-                                                                "Choose desired Memory capacity (GB)",
-                                                            ],
-                                                            html_for="memory-choice",
-                                                            className="form-label",
-                                                        ),
-                                                        dcc.Slider(
-                                                            id="memory-choice",
-                                                            min=128,
-                                                            max=1024,
-                                                            step=None,
-                                                            included=False,
-                                                            value=256,
-                                                            marks={
-                                                                128: "128",
-                                                                256: "256",
-                                                                512: "512",
-                                                                1024: "1024",
-                                                            },
-                                                            className="dash-slider",
-                                                        ),
-                                                    ],
-                                                    className="mr-3 ml-3 mb-2 mt-2",
-                                                ),
-                                                dbc.Row(
-                                                    children=[
-                                                        dbc.Label(
-                                                            [
-                                                                html.Span(
-                                                                    "🖥️ ",
-                                                                    style={
-                                                                        "fontSize": "1.2em",
-                                                                        "marginRight": "8px",
-                                                                    },
-                                                                ),
-                                                                "Choose desired RAM capacity (GB)",
-                                                            ],
-                                                            html_for="ram-choice",
-                                                            className="form-label",
-                                                        ),
-                                                        dcc.Slider(
-                                                            id="ram-choice",
-                                                            min=4,
-                                                            max=24,
-                                                            step=None,
-                                                            value=8,
-                                                            included=False,
-                                                            marks={
-                                                                4: "4",
-                                                                6: "6",
-                                                                8: "8",
-                                                                10: "10",
-                                                                12: "12",
-                                                                24: "24",
-                                                            },
-                                                            className="dash-slider",
-                                                        ),
-                                                    ],
-                                                    className="mr-3 ml-3 mb-2 mt-2",
-                                                ),
-                                                dbc.Row(
-                                                    children=[
-                                                        dbc.Label(
-                                                            [
-                                                                html.Span(
-                                                                    "🔋 ",
-                                                                    style={
-                                                                        "fontSize": "1.2em",
-                                                                        "marginRight": "8px",
-                                                                    },
-                                                                ),
-                                                                "Choose desired battery capacity (mAh)",
-                                                            ],
-                                                            html_for="cam-choice",
-                                                            className="form-label",
-                                                        ),
-                                                        dcc.Slider(
-                                                            id="cam-choice",
-                                                            min=4000,
-                                                            max=7000,
-                                                            step=100,
-                                                            included=False,
-                                                            value=5000,
-                                                            marks={
-                                                                4000: "4000",
-                                                                4500: "4500",
-                                                                5000: "5000",
-                                                                5500: "5500",
-                                                                6000: "6000",
-                                                                6500: "6500",
-                                                                6500: "6500",
-                                                                7000: "7000",
-                                                            },
-                                                            className="dash-slider",
-                                                        ),
-                                                    ],
-                                                    className="mr-3 ml-3 mb-2 mt-2",
+                                            html.P(
+                                                (
+                                                    "This app uses decision support tools to "
+                                                    "quickly and easily find phones which reflect "
+                                                    "the user's desires. You only need to input your preferences "
+                                                    "and the app will show you the phone "
+                                                    "which matches the preferences the best. "
+                                                    "In case you do not like the suggested phone, "
+                                                    "the app also shows you some alternatives close to your preferences."
                                                 ),
-                                                dbc.Row(
-                                                    children=[
-                                                        dbc.Label(
-                                                            [
-                                                                html.Span(
-                                                                    "💰 ",
-                                                                    style={
-                                                                        "fontSize": "1.2em",
-                                                                        "marginRight": "8px",
-                                                                    },
-                                                                ),
-                                                                "Choose desired budget (Euros)",
-                                                            ],
-                                                            html_for="cost-choice",
-                                                            className="form-label",
-                                                        ),
-                                                        dcc.Slider(
-                                                            id="cost-choice",
-                                                            min=50,
-                                                            max=2000,
-                                                            step=50,
-                                                            included=False,
-                                                            value=600,
-                                                            marks={
-                                                                50: "50",
-                                                                200: "200",
-                                                                400: "400",
-                                                                600: "600",
-                                                                800: "800",
-                                                                1000: "1000",
-                                                                1200: "1200",
-                                                                1400: "1400",
-                                                                1600: "1600",
-                                                                1800: "1800",
-                                                                2000: "2000",
-                                                            },
-                                                            className="dash-slider",
+                                                className="main-p",
+                                            ),
+                                            html.Div(
+                                                children=[
+                                                    dcc.Link(
+                                                        dbc.Button(
+                                                            "START",
+                                                            color="primary",
+                                                            className="start-button",
                                                         ),
-                                                    ],
-                                                    className="mr-3 ml-3 mb-2 mt-2",
-                                                    style={
-                                                        "position": "relative",
-                                                        "zIndex": "1000",
-                                                    },
-                                                ),
-                                            ],
-                                            style={
-                                                "maxHeight": "600px",
-                                                "overflow": "visible",
-                                            },
-                                            className="form_preferences",
+                                                        href="/app",
+                                                        refresh=True,
+                                                    ),
+                                                    # dbc.Button("START", color="primary", className="start-button")
+                                                ],
+                                                className="start-button-div",
+                                            ),
+                                        ],
+                                        width=6,
+                                        className="main-col-text",
+                                    ),
+                                    dbc.Col(
+                                        children=[
+                                            # html.P("Example")
+                                            html.Img(
+                                                src=asset_url("home_screen.png"),
+                                                alt="image",
+                                                className="main_figure",
+                                            )
+                                        ],
+                                        width=6,
+                                        className="figure-main",
+                                    ),
+                                ],
+                                className="row-main",
+                            )
+                        ]
+                    )
+                ],
+                className="g-0 row-main",
+            ),
+        ],
+    )
+
+
+# Main Application Page Layout
+# Interactive phone selection interface with preferences form and results display
+@functools.cache
+def app_page():
+    """
+    Build the phone selection page layout on first use.
+
+    Returns:
+        html.Div: Preferences form and results display
+    """
+    return html.Div(
+        children=[
+            dbc.Navbar(
+                dbc.Container(
+                    [
+                        html.A(
+                            # Use row and col to control vertical alignment of logo / brand
+                            dbc.Row(
+                                [
+                                    dbc.Col(
+                                        html.Img(
+                                            src=asset_url(PLOTLY_LOGO), height="30px"
                                         ),
-                                    ]
-                                ),
-                            ],
-                            className="mr-3 ml-3 mb-2 mt-2",
+                                        width="auto",
+                                    ),
+                                    dbc.Col(
+                                        dbc.NavbarBrand(
+                                            "Multiobjective Optimization Group - Phone selection tool",
+                                            className="ms-2",
+                                        )
+                                    ),
+                                ],
+                                align="center",
+                                className="g-0",
+                            ),
+                            href="/",
+                            style={"textDecoration": "none"},
                         ),
+                        dbc.NavbarToggler(id="navbar-toggler", n_clicks=0),
                     ],
-                    width=6,
+                    fluid=True,
                 ),
-                dbc.Col(
-                    children=[
-                        dbc.Card(
-                            children=[
-                                dbc.CardHeader("The best phone for you is:"),
-                                dbc.Row(
-                                    children=[
-                                        dbc.Col(
-                                            children=[
-                                                # html.Div(html.Img(src=app.get_asset_url('images/1.jpg'), style={'width':'70%'}))
-                                                html.Div(
-                                                    id="figure-result",
-                                                    style={
-                                                        "alignItems": "center",
-                                                        "padding": "1rem",
-                                                        "display": "flex",
-                                                        "flexDirection": "column",
-                                                        "justifyContent": "center",
-                                                        "height": "100%",
-                                                    },
-                                                ),
-                                                html.Div(
-                                                    id="phone-name",
-                                                    style={
-                                                        "textAlign": "center",
-                                                        "fontWeight": "bold",
-                                                        "fontSize": "16px",
-                                                        "padding": "5px 0",
-                                                        "marginTop": "5px",
-                                                    },
-                                                ),
-                                            ],
-                                            width=5,
-                                            style={
-                                                "display": "flex",
-                                                "flexDirection": "column",
-                                                "height": "100%",
-                                            },
-                                        ),
-                                        dbc.Col(
-                                            children=[
-                                                dbc.CardBody(
-                                                    id="results",
-                                                    children=[],
-                                                    style={
-                                                        "height": "100%",
-                                                        "display": "flex",
-                                                        "flexDirection": "column",
-                                                        "justifyContent": "flex-start",
-                                                    },
-                                                ),
-                                            ],
-                                            style={
-                                                "display": "flex",
-                                                "flexDirection": "column",
-                                            },
-                                        ),
-                                    ],
-                                    style={
-                                        "alignItems": "stretch",
-                                    },
-                                ),
-                            ],
-                            className="mb-4",
-                        ),
-                        dbc.Card(
-                            children=[
-                                dbc.CardHeader("Other great phones:"),
-                                dbc.CardBody(
-                                    id="other-results",
-                                    children=(
+                color="#002957",
+                dark=True,
+            ),
+            dbc.Row(
+                children=[
+                    dbc.Col(
+                        children=[
+                            # Top card with details(?)
+                            dbc.Card(
+                                children=[
+                                    dbc.CardHeader(
+                                        "Your preferences",
+                                        className="card-header",
+                                    ),
+                                    dbc.CardBody(
                                         [
-                                            dbc.Row(
-                                                children=[
-                                                    dbc.Col(
+                                            html.P(
+                                                (
+                                                    "INSTRUCTIONS: Input your preferences "
+                                                    "below. The box on top right shows the phone "
+                                                    "which matches the preferences the best. "
+                                                    "The box on bottom right provides some "
+                                                    "close alternatives."
+                                                ),
+                                                className="card-text",
+                                            ),
+                                            dbc.Form(
+                                                [
+                                                    dbc.Row(
+                                                        children=[
+                                                            dbc.Label(
+                                                                [
+                                                                    html.Span(
+                                                                        "💾 ",
+                                                                        style={
+                                                                            "fontSize": "1.2em",
+                                                                            "marginRight": "8px",
+                                                                        },
+                                                                    ),
+                                                                    "Choose desired Memory capacity (GB)",
+                                                                ],
+                                                                html_for="memory-choice",
+                                                                className="form-label",
+                                                            ),
+                                                            dcc.Slider(
+                                                                id="memory-choice",
+                                                                included=False,
+                                                                className="dash-slider",
+                                                                updatemode=slider_updatemode,
+                                                                **slider_settings[
+                                                                    "memory-choice"
+                                                                ],
+                                                            ),
+                                                        ],
+                                                        className="mr-3 ml-3 mb-2 mt-2",
+                                                    ),
+                                                    dbc.Row(
+                                                        children=[
+                                                            dbc.Label(
+                                                                [
+                                                                    html.Span(
+                                                                        "🖥️ ",
+                                                                        style={
+                                                                            "fontSize": "1.2em",
+                                                                            "marginRight": "8px",
+                                                                        },
+                                                                    ),
+                                                                    "Choose desired RAM capacity (GB)",
+                                                                ],
+                                                                html_for="ram-choice",
+                                                                className="form-label",
+                                                            ),
+                                                            dcc.Slider(
+                                                                id="ram-choice",
+                                                                included=False,
+                                                                className="dash-slider",
+                                                                updatemode=slider_updatemode,
+                                                                **slider_settings[
+                                                                    "ram-choice"
+                                                                ],
+                                                            ),
+                                                        ],
+                                                        className="mr-3 ml-3 mb-2 mt-2",
+                                                    ),
+                                                    dbc.Row(
+                                                        children=[
+                                                            dbc.Label(
+                                                                [
+                                                                    html.Span(
+                                                                        "🔋 ",
+                                                                        style={
+                                                                            "fontSize": "1.2em",
+                                                                            "marginRight": "8px",
+                                                                        },
+                                                                    ),
+                                                                    "Choose desired battery capacity (mAh)",
+                                                                ],
+                                                                html_for="cam-choice",
+                                                                className="form-label",
+                                                            ),
+                                                            dcc.Slider(
+                                                                id="cam-choice",
+                                                                included=False,
+                                                                className="dash-slider",
+                                                                updatemode=slider_updatemode,
+                                                                **slider_settings[
+                                                                    "cam-choice"
+                                                                ],
+                                                            ),
+                                                        ],
+                                                        className="mr-3 ml-3 mb-2 mt-2",
+                                                    ),
+                                                    dbc.Row(
                                                         children=[
-                                                            dbc.Row(
-                                                                html.Div(
-                                                                    id=f"figure-option-{i}"
-                                                                )
+                                                            dbc.Label(
+                                                                [
+                                                                    html.Span(
+                                                                        "💰 ",
+                                                                        style={
+                                                                            "fontSize": "1.2em",
+                                                                            "marginRight": "8px",
+                                                                        },
+                                                                    ),
+                                                                    "Choose desired budget (Euros)",
+                                                                ],
+                                                                html_for="cost-choice",
+                                                                className="form-label",
                                                             ),
-                                                            dbc.Row(
-                                                                html.Span(
-                                                                    f"{i}. ",
-                                                                    id=f"other-results-list-{i}",
-                                                                )
+                                                            dcc.Slider(
+                                                                id="cost-choice",
+                                                                included=False,
+                                                                className="dash-slider",
+                                                                updatemode=slider_updatemode,
+                                                                **slider_settings[
+                                                                    "cost-choice"
+                                                                ],
                                                             ),
-                                                        ]
-                                                    )
-                                                    for i in range(2, 6)
-                                                ]
+                                                        ],
+                                                        className="mr-3 ml-3 mb-2 mt-2",
+                                                        style={
+                                                            "position": "relative",
+                                                            "zIndex": "1000",
+                                                        },
+                                                    ),
+                                                ],
+                                                style={
+                                                    "maxHeight": "600px",
+                                                    "overflow": "visible",
+                                                },
+                                                className="form_preferences",
                                             ),
                                         ]
-                                        + [
-                                            dbc.Tooltip(
-                                                id=f"other-results-tooltip-{i}",
-                                                target=f"figure-option-{i}",
-                                                placement="bottom",
-                                                className="tooltip-details",
-                                            )
-                                            for i in range(2, 6)
-                                        ]
                                     ),
-                                ),
-                            ],
-                            className="mt-4",
-                        ),
-                        html.Div(id="tooltips"),
-                    ],
-                    width=6,
-                    className="mb-2 mt-2",
-                ),
-            ],
-            className="row-main-content",
-        ),
-        dbc.Row([html.Div(id="callback-dump")]),
-    ],
-    className="div_app",
-)
+                                ],
+                                className="mr-3 ml-3 mb-2 mt-2",
+                            ),
+                        ],
+                        width=6,
+                    ),
+                    dbc.Col(
+                        children=[
+                            dbc.Card(
+                                children=[
+                                    dbc.CardHeader("The best phone for you is:"),
+                                    dbc.Row(
+                                        children=[
+                                            dbc.Col(
+                                                children=[
+                                                    # html.Div(html.Img(src=app.get_asset_url('images/1.jpg'), style={'width':'70%'}))
+                                                    html.Div(
+                                                        id="figure-result",
+                                                        style={
+                                                            "alignItems": "center",
+                                                            "padding": "1rem",
+                                                            "display": "flex",
+                                                            "flexDirection": "column",
+                                                            "justifyContent": "center",
+                                                            "height": "100%",
+                                                        },
+                                                    ),
+                                                    html.Div(
+                                                        id="phone-name",
+                                                        style={
+                                                            "textAlign": "center",
+                                                            "fontWeight": "bold",
+                                                            "fontSize": "16px",
+                                                            "padding": "5px 0",
+                                                            "marginTop": "5px",
+                                                        },
+                                                    ),
+                                                ],
+                                                width=5,
+                                                style={
+                                                    "display": "flex",
+                                                    "flexDirection": "column",
+                                                    "height": "100%",
+                                                },
+                                            ),
+                                            dbc.Col(
+                                                children=[
+                                                    dbc.CardBody(
+                                                        id="results",
+                                                        children=[],
+                                                        style={
+                                                            "height": "100%",
+                                                            "display": "flex",
+                                                            "flexDirection": "column",
+                                                            "justifyContent": "flex-start",
+                                                        },
+                                                    ),
+                                                ],
+                                                style={
+                                                    "display": "flex",
+                                                    "flexDirection": "column",
+                                                },
+                                            ),
+                                        ],
+                                        style={
+                                            "alignItems": "stretch",
+                                        },
+                                    ),
+                                ],
+                                className="mb-4",
+                            ),
+                            dbc.Card(
+                                children=[
+                                    dbc.CardHeader("Other great phones:"),
+                                    dbc.CardBody(
+                                        id="other-results",
+                                        children=(
+                                            [
+                                                dbc.Row(
+                                                    children=[
+                                                        dbc.Col(
+                                                            children=[
+                                                                dbc.Row(
+                                                                    html.Div(
+                                                                        id=f"figure-option-{i}"
+                                                                    )
+                                                                ),
+                                                                dbc.Row(
+                                                                    html.Span(
+                                                                        f"{i}. ",
+                                                                        id=f"other-results-list-{i}",
+                                                                    )
+                                                                ),
+                                                            ]
+                                                        )
+                                                        for i in range(
+                                                            2, RESULTS_COUNT + 1
+                                                        )
+                                                    ]
+                                                ),
+                                            ]
+                                            + [
+                                                dbc.Tooltip(
+                                                    id=f"other-results-tooltip-{i}",
+                                                    target=f"figure-option-{i}",
+                                                    placement="bottom",
+                                                    className="tooltip-details",
+                                                )
+                                                for i in range(2, RESULTS_COUNT + 1)
+                                            ]
+                                        ),
+                                    ),
+                                ],
+                                className="mt-4",
+                            ),
+                            html.Div(id="tooltips"),
+                        ],
+                        width=6,
+                        className="mb-2 mt-2",
+                    ),
+                ],
+                className="row-main-content",
+            ),
+            dbc.Row([html.Div(id="callback-dump")]),
+            *(
+                [
+                    dcc.Store(id=source, data=slider_settings[slider]["value"])
+                    for slider, source in preference_sources.items()
+                ]
+                + [dcc.Store(id="slider-update-ms", data=SLIDER_UPDATE_MS)]
+                if DEFERRED_UPDATES
+                else []
+            ),
+            # Ranking shown in this page, used to only send the changed outputs
+            *([] if CLIENTSIDE_RANKING else [dcc.Store(id="last-ranking")]),
+        ],
+        className="div_app",
+    )
+
+
+# Outputs and inputs of the phone recommendation callback
+results_outputs = [
+    Output("results", "children"),  # Best phone details table
+    Output("figure-result", "children"),  # Best phone image
+    Output("phone-name", "children"),  # Best phone name
+    *[
+        Output(f"figure-option-{i}", "children") for i in range(2, RESULTS_COUNT + 1)
+    ],  # Alternative phone images
+    *[
+        Output(f"other-results-list-{i}", "children")
+        for i in range(2, RESULTS_COUNT + 1)
+    ],  # Alternative phone names
+    *[
+        Output(f"other-results-tooltip-{i}", "children")
+        for i in range(2, RESULTS_COUNT + 1)
+    ],  # Alternative phone tooltips
+]
+results_inputs = [
+    Input(source, "data" if source != slider else "value")
+    for slider, source in preference_sources.items()  # User preference inputs
+]
 
 
 # Main Callback Function for Phone Recommendation
-@callback(
-    [
-        Output("results", "children"),  # Best phone details table
-        *[Output(f"figure-result", "children")],  # Best phone image
-        Output("phone-name", "children"),  # Best phone name
-        *[
-            Output(f"figure-option-{i}", "children") for i in range(2, 6)
-        ],  # Alternative phone images
-        *[
-            Output(f"other-results-list-{i}", "children") for i in range(2, 6)
-        ],  # Alternative phone names
-        *[
-            Output(f"other-results-tooltip-{i}", "children") for i in range(2, 6)
-        ],  # Alternative phone tooltips
-    ],
-    [
-        Input(f"{attr}-choice", "value")
-        for attr in ["memory", "ram", "cam", "cost"]  # User preference inputs
-    ],
-)
+# (registered below, either on the server or in the browser)
 def results(*choices):
     """
     Calculate optimal phone recommendations based on user preferences.
@@ -555,160 +941,250 @@ def results(*choices):
         - Alternative phone names (up to 4)
         - Alternative phone detail tooltips (up to 4)
     """
-    # Use all available phone data (OS filter removed)
-    choice_data = data
+    structures = current_structures()
+    ranking, colors, outputs = recommend(
+        *choices, structures=structures, namespace=structures.cache_namespace
+    )
+    return outputs
+
+
+@results_cache.memoize
+def recommend(*choices, structures):
+    """
+    Rank the phones of one catalogue version and build the result outputs.
+
+    Memoized under the cache namespace of ``structures``, so a cached
+    entry always pairs a ranking with the outputs built from it, and a hit
+    does no ranking work.
+
+    Args:
+        *choices: Rounded user preference values
+        structures: RankingStructures of the catalogue to rank
+
+    Returns:
+        tuple: (ranking, colors, outputs): row positions of the shown phones,
+        best first; indicator colours of the best phone; results() outputs
+    """
+    # The criteria matrix (Memory, RAM, Battery, Price) is normalized to [0,1]
+    # and direction-flipped once at load time, so that 1 is always the best value.
+    # Here only the user aspirations are normalized to the same scale, and the
+    # Chebyshev distance (maximum deviation across all criteria) is computed
+    with callback_metrics.phase("ranking"):
+        distance_order = rank(choices, structures)
+
+    # Static components of the ranked phones, built once per phone and cached
+    ranked = [structures.fragments[i] for i in distance_order]
 
-    # Extract relevant criteria for optimization
-    # These criteria have different units: Memory(GB), RAM(GB), Battery(mAh), Price(€)
-    # Proper normalization is essential for meaningful comparison
-    relevant_data = choice_data[
-        [
-            "Memory (GB)",
-            "RAM (GB)",
-            "Battery (mAh)",
-            "Price (Euros)",
-        ]
-    ].reset_index(drop=True)
-    # Prepare data for display cards (include Id for image mapping)
-    card_data_columns = list(details_on_card) + ["Id"]
-    card_data = choice_data[card_data_columns].reset_index(drop=True)
-
-    # NORMALIZATION STRATEGY:
-    # Problem: Criteria have different units and scales (GB vs mAh vs €)
-    # Solution: Normalize both data and aspirations to [0,1] scale before distance calculation
-    # This ensures all criteria contribute equally to the final ranking
-
-    # Step 1: Normalize data to [0,1] scale for each criterion
-    # This handles different units (GB, mAh, €) by scaling to common range
-    data_min = relevant_data.min().values
-    data_max = relevant_data.max().values
-    data_range = data_max - data_min
-
-    # Normalize data to [0,1] where 0 = worst value, 1 = best value for each criterion
-    normalized_data = (relevant_data - data_min) / data_range
-
-    # Step 2: Apply optimization directions AFTER normalization
-    # For minimize criteria (Price), flip the scale: 1-normalized_value
-    # For maximize criteria (Memory, RAM, Battery), keep as is
-    optimization_directions = np.array([1, 1, 1, -1])  # 1=maximize, -1=minimize
-
-    for i, direction in enumerate(optimization_directions):
-        if direction == -1:  # Minimize criterion (Price)
-            normalized_data.iloc[:, i] = 1 - normalized_data.iloc[:, i]
-
-    # Step 3: Normalize user aspirations to the same [0,1] scale
-    aspirations = np.array(choices)  # All choices are now numerical preferences
-    normalized_aspirations = (aspirations - data_min) / data_range
-
-    # Apply same optimization direction transformation to aspirations
-    for i, direction in enumerate(optimization_directions):
-        if direction == -1:  # Minimize criterion (Price)
-            normalized_aspirations[i] = 1 - normalized_aspirations[i]
-
-    # Step 4: Calculate distance in normalized space
-    # Uses Chebyshev distance (maximum deviation across all criteria)
-    # Now both data and aspirations are in [0,1] scale, so distances are meaningful
-    distance = np.abs(normalized_aspirations - normalized_data).max(axis=1)
-
-    # Sort phones by distance (smallest distance = best match)
-    distance_order = np.argsort(distance)
     # Generate results for the best matching phone
-    best = table_from_data(card_data.loc[distance_order.values[0]], choices)
-
-    # Generate alternative options (up to 4 additional phones)
-    total_number = len(distance_order)
-    if total_number >= 4:
-        # If enough phones available, show next 4 best options
-        others, tooltips, figures = other_options(
-            card_data.loc[distance_order.values[1:5]]
-        )
-    else:
-        # If fewer phones available, show all remaining and pad with empty slots
-        others, tooltips, figures = other_options(
-            card_data.loc[distance_order.values[1:total_number]]
+    best = table_from_data(ranked[0], choices)
+
+    # Generate alternative options (up to RESULTS_COUNT - 1 additional phones)
+    others, tooltips, figures = other_options(ranked[1:])
+    if len(distance_order) < RESULTS_COUNT:
+        # If fewer phones available, pad with empty slots
+        others = others + [f"{i}. -" for i in range(len(others) + 2, RESULTS_COUNT + 1)]
+        tooltips = tooltips + [
+            None for i in range(len(tooltips) + 2, RESULTS_COUNT + 1)
+        ]
+        figures = figures + [None for i in range(len(figures) + 2, RESULTS_COUNT + 1)]
+
+    return (
+        [int(i) for i in distance_order],
+        indicator_colors(ranked[0], choices),
+        (best, ranked[0].image, ranked[0].name, *figures, *others, *tooltips),
+    )
+
+
+def rank(choices, structures):
+    """
+    Return the row positions of the phones closest to the user preferences.
+
+    Uses the precomputed slider grid when available and falls back to the
+    ranking engine (layered by Pareto front with PARETO_RANKING) for values
+    that are not on the grid.
+
+    Args:
+        choices: User preference values [memory, ram, battery, price]
+        structures: RankingStructures of the catalogue to rank
+
+    Returns:
+        np.ndarray: Up to RESULTS_COUNT row positions, best match first
+    """
+    if structures.grid is not None:
+        distance_order = structures.grid.lookup(choices)
+        if distance_order is not None:
+            return distance_order
+    return structures.ranker.top_k(choices, RESULTS_COUNT)
+
+
+class PhoneFragments:
+    """
+    Prebuilt, choice-independent result components of one phone.
+
+    Args:
+        row: Dict with the phone's card data
+    """
+
+    def __init__(self, row):
+        self.name = f"{row['Brand']} {row['Model']}"
+        self.criteria = np.array([row[col] for col in comparable_criteria], float)
+
+        # Best-phone table rows; comparable criteria get one row per indicator
+        # colour, so a request only has to pick the right one
+        self.rows = []
+        for col, value in row.items():
+            if col in hidden_fields:
+                continue
+            if col in comparable_criteria:
+                indicators = {
+                    color: html.Span(" ▉", style={"color": color})
+                    for color in ("green", "red")
+                }
+                self.rows.append(
+                    (
+                        comparable_criteria.index(col),
+                        {
+                            color: spec_row(col, value, indicator)
+                            for color, indicator in indicators.items()
+                        },
+                    )
+                )
+            else:
+                self.rows.append(
+                    spec_row(col, value, html.Span(" ", style={"color": "transparent"}))
+                )
+
+        # Tooltip table of the card data without the Id
+        self.tooltip = table_from_data_horizontal(pd.Series(row).drop("Id"))
+        self.figure = get_figures_options(row["Id"])
+        self.image = html.Div(
+            phone_image(
+                row["Id"],
+                style={"width": "90%", "objectFit": "contain"},
+                sizes="(max-width: 768px) 40vw, 20vw",
+            )
         )
-        others = others + [f"{i}. -" for i in range(len(others) + 2, 6)]
-        tooltips = tooltips + [None for i in range(len(tooltips) + 2, 6)]
-        figures = figures + [None for i in range(len(figures) + 2, 6)]
-
-    # Generate image component for the best phone
-    best_phone_data = card_data.loc[distance_order.values[0]]
-    id = best_phone_data["Id"]
-    phone_name = best_phone_data["Brand"] + " " + best_phone_data["Model"]
-
-    idresult = html.Div(
-        html.Img(
-            src=app.get_asset_url(f"images/{id}.jpg"),
-            style={"width": "90%", "objectFit": "contain"},
+
+
+# Number of phones whose PhoneFragments are kept per catalogue
+FRAGMENT_CACHE_SIZE = 1024
+
+
+class FragmentCache:
+    """
+    PhoneFragments built on first use, with least-recently-used eviction.
+
+    A request only shows RESULTS_COUNT phones, so the components of a phone are
+    built when it is first ranked rather than for the whole catalogue at load.
+
+    Args:
+        card_data: DataFrame with the card data of the catalogue
+        maxsize: Maximum number of phones whose fragments are kept
+    """
+
+    def __init__(self, card_data, maxsize=FRAGMENT_CACHE_SIZE):
+        self.card_data = card_data
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.card_data)
+
+    def __getitem__(self, position):
+        """
+        Return the PhoneFragments of a row position of the catalogue.
+        """
+        position = int(position)
+        with self._lock:
+            fragments = self._entries.get(position)
+            if fragments is not None:
+                self._entries.move_to_end(position)
+                return fragments
+        fragments = PhoneFragments(
+            self.card_data.iloc[[position]].to_dict("records")[0]
         )
+        with self._lock:
+            self._entries[position] = fragments
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return fragments
+
+
+def build_phone_fragments(card_data):
+    """
+    Prebuild the static result components of every phone.
+
+    Args:
+        card_data: DataFrame with the card data of the catalogue
+
+    Returns:
+        list: PhoneFragments per row position of the catalogue
+    """
+    return [PhoneFragments(row) for row in card_data.to_dict("records")]
+
+
+def spec_row(col, value, color_indicator):
+    """
+    Create one row of the best-phone specification table.
+
+    Args:
+        col: Specification name
+        value: Specification value
+        color_indicator: Span shown next to the value
+
+    Returns:
+        html.Tr: Table row
+    """
+    return html.Tr(
+        [
+            html.Th(col),  # Specification name
+            html.Td([str(value)]),  # Actual value
+            html.Td([color_indicator]),  # Color indicator (or empty)
+        ]
     )
 
-    return (best, idresult, phone_name, *figures, *others, *tooltips)
 
+def indicator_colors(fragments, choices):
+    """
+    Compute the colour indicator of each comparable criterion.
+
+    Args:
+        fragments: PhoneFragments of the phone
+        choices: List of user preference values [memory, ram, battery, price]
 
-def table_from_data(data, choices):
+    Returns:
+        list: "green" or "red" per criterion in comparable_criteria
+    """
+    # Calculate difference between phone specs and user preferences
+    # For Memory, RAM, Battery: phone_value - user_preference (positive = phone exceeds preference)
+    # For Price: (phone_value - user_preference) * -1 (positive = phone is cheaper than budget)
+    diff = (fragments.criteria - choices) * [1, 1, 1, -1]
+
+    # GREEN = phone meets or exceeds preference (higher Memory/RAM/Battery, or lower Price)
+    # RED = phone falls short of preference (lower Memory/RAM/Battery, or higher Price)
+    return ["green" if d >= 0 else "red" for d in diff]
+
+
+def table_from_data(fragments, choices):
     """
     Create a formatted table showing phone specifications with color-coded comparison to user preferences.
 
     Args:
-        data: Pandas Series containing phone specifications
+        fragments: PhoneFragments of the phone
         choices: List of user preference values [memory, ram, battery, price]
 
     Returns:
         dbc.Table: Bootstrap table component with specifications and color indicators
     """
-    # Criteria that can be compared to user preferences
-    comparable_criteria = ["Memory (GB)", "RAM (GB)", "Battery (mAh)", "Price (Euros)"]
+    colors = indicator_colors(fragments, choices)
 
-    # Calculate difference between phone specs and user preferences
-    # For Memory, RAM, Battery: phone_value - user_preference (positive = phone exceeds preference)
-    # For Price: (phone_value - user_preference) * -1 (positive = phone is cheaper than budget)
-    diff = (data[comparable_criteria].values - choices) * [1, 1, 1, -1]
-
-    # Create color mapping for comparable criteria
-    color_map = {}
-    for i, col in enumerate(comparable_criteria):
-        # GREEN = phone meets or exceeds preference (higher Memory/RAM/Battery, or lower Price)
-        # RED = phone falls short of preference (lower Memory/RAM/Battery, or higher Price)
-        color_map[col] = "green" if diff[i] >= 0 else "red"
-
-    # Fields to hide from the table display
-    hidden_fields = [
-        "Id",
-        "Brand",
-        "Model",
-        "Release Date",
-        "Release_Date",
-        "brand",
-        "model",
-        "release_date",
+    # Rows of comparable criteria are (criterion index, {colour: row}) pairs
+    table_rows = [
+        row[1][colors[row[0]]] if isinstance(row, tuple) else row
+        for row in fragments.rows
     ]
 
-    # Create table rows for all displayed specifications
-    table_rows = []
-    # Iterate through all columns, excluding hidden fields
-    for col in data.index:
-        # Skip hidden fields
-        if col in hidden_fields:
-            continue
-
-        if col in comparable_criteria:
-            # Show color indicator for comparable criteria
-            color_indicator = html.Span(" ▉", style={"color": color_map[col]})
-        else:
-            # No color indicator for non-comparable criteria
-            color_indicator = html.Span(" ", style={"color": "transparent"})
-
-        table_rows.append(
-            html.Tr(
-                [
-                    html.Th(col),  # Specification name
-                    html.Td([str(data[col])]),  # Actual value
-                    html.Td([color_indicator]),  # Color indicator (or empty)
-                ]
-            )
-        )
-
     return dbc.Table([html.Tbody(table_rows)], style={"fontSize": "1rem"})
 
 
@@ -737,23 +1213,64 @@ def get_figures_options(id):
     Returns:
         html.Div: Div containing the phone image
     """
-    import time
-
-    cache_bust = int(time.time())  # Current timestamp to prevent caching
     return html.Div(
-        html.Img(
-            src=app.get_asset_url(f"images/{id}.jpg?v={cache_bust}"),
+        phone_image(
+            id,
             style={"width": "70%", "height": "200px", "objectFit": "contain"},
+            sizes="200px",
+        )
+    )
+
+
+def phone_image(id, style, sizes):
+    """
+    Create a responsive image of a phone.
+
+    When resized variants have been built, the image offers them through
+    ``srcset`` (WebP first, JPEG as fallback) so that the browser downloads the
+    smallest one that fits; otherwise the original image is used.
+
+    Args:
+        id: Phone ID used to locate the corresponding image file
+        style: Style of the image
+        sizes: Displayed width of the image, as an HTML ``sizes`` attribute
+
+    Returns:
+        html.Picture or html.Img: Image component
+    """
+    path = f"images/{id}.jpg"
+    variants = available_variants(app.config.assets_folder, path)
+    if not variants:
+        return html.Img(src=asset_url(path), style=style)
+
+    def srcset(extension):
+        return ", ".join(
+            f"{asset_url(variant)} {width}w" for variant, width in variants[extension]
         )
+
+    return html.Picture(
+        [
+            *(
+                [html.Source(type="image/webp", srcSet=srcset("webp"), sizes=sizes)]
+                if "webp" in variants
+                else []
+            ),
+            html.Img(
+                src=asset_url(path),
+                srcSet=srcset("jpg") if "jpg" in variants else None,
+                sizes=sizes,
+                style=style,
+            ),
+        ]
     )
 
 
-def other_options(data):
+def other_options(ranked):
     """
     Process alternative phone options to generate display components.
 
     Args:
-        data: DataFrame containing alternative phone specifications
+        ranked: PhoneFragments of the alternative phones, best first
 
     Returns:
         tuple: (contents, tables, figures)
@@ -761,25 +1278,170 @@ def other_options(data):
             - tables: List of specification tables for tooltips
             - figures: List of phone images
     """
-    contents = []  # Phone names for display
-    tables = []  # Specification tables for tooltips
-    figures = []  # Phone images
-    i = 2  # Start numbering from 2 (since 1 is the best phone)
-
-    for index, row in data.iterrows():
-        contents.append(f"{i}. {row['Brand']} {row['Model']}")
-        id = row["Id"]
-        tables.append(
-            table_from_data_horizontal(row[1:])
-        )  # Skip first column (Model name)
-        figures.append(get_figures_options(id))
-        i = i + 1
+    # Start numbering from 2 (since 1 is the best phone)
+    contents = [f"{i}. {phone.name}" for i, phone in enumerate(ranked, start=2)]
+    tables = [phone.tooltip for phone in ranked]
+    figures = [phone.figure for phone in ranked]
 
     return contents, tables, figures
 
 
+def warm_up():
+    """
+    Do the work deferred at import: update the image variants, load the
+    catalogue, build the ranking structures and the page layouts, and cache
+    the result for the default slider values.
+
+    Called before the app serves requests (by the Gunicorn hooks and by
+    ``python main.py``); without it the work happens on first use, and the
+    image variants are not updated.
+    """
+    if IMAGE_DERIVATIVES:
+        try:
+            with startup_audit.phase("image variants"):
+                build_derivatives(app.config.assets_folder)
+        except (ImportError, OSError) as error:
+            print(f"Image variants not updated: {error}")
+    current_structures()
+    with startup_audit.phase("layouts"):
+        home_page()
+        app_page()
+    with startup_audit.phase("default results"):
+        results(*(slider_settings[slider]["value"] for slider in preference_sources))
+    startup_audit.print_report("Warm-up")
+    startup_audit.stop_imports()
+    warmed_up.set()
+
+
+# Set once warm_up() has completed; reported by /readyz
+warmed_up = threading.Event()
+
+
+# Health endpoints for the container and OpenShift probes. They bypass Dash
+# and only read process state, so probes cost next to nothing.
+@server.route("/healthz")
+def healthz():
+    """
+    Liveness probe: the process is up and serving requests.
+
+    Returns:
+        Response: "ok" with status 200
+    """
+    return Response("ok", mimetype="text/plain")
+
+
+@server.route("/readyz")
+def readyz():
+    """
+    Readiness probe: the catalogue is loaded, the ranking structures and
+    layouts are built, and the default result is cached.
+
+    Returns:
+        Response: JSON with the state of each check; status 200 when all pass,
+        503 otherwise
+    """
+    structures = ranking_structures
+    checks = {
+        "catalogue": structures is not None,
+        "warm": warmed_up.is_set(),
+    }
+    ready = all(checks.values())
+    return Response(
+        json.dumps(
+            {
+                "ready": ready,
+                "phones": len(structures.engine) if structures else 0,
+                "catalogue_version": structures.fingerprint if structures else None,
+                **checks,
+            }
+        ),
+        status=200 if ready else 503,
+        mimetype="application/json",
+    )
+
+
+if CATALOGUE_RELOAD_INTERVAL > 0:
+    catalogue_watcher = CatalogueWatcher(
+        catalogue_paths.values(), reload_catalogue, CATALOGUE_RELOAD_INTERVAL
+    )
+    # Started by the first request of each process, as Gunicorn workers are
+    # forked after this module is loaded
+    server.before_request(catalogue_watcher.start)
+
+if CLIENTSIDE_RANKING:
+    app.clientside_callback(
+        ClientsideFunction(namespace="ranking", function_name="results"),
+        results_outputs,
+        results_inputs + [Input("ranking-data", "data")],
+    )
+else:
+
+    @callback(
+        results_outputs + [Output("last-ranking", "data")],
+        results_inputs + [State("last-ranking", "data")],
+    )
+    @callback_metrics.callback("results")
+    def update_results(*args):
+        """
+        Send only the recommendation outputs that changed since the last update.
+
+        Outputs of slots whose phone did not change are replaced by
+        ``no_update``; many slider moves keep the winner and most alternatives.
+
+        Args:
+            *args: User preference values, followed by the data of the
+                "last-ranking" store (None on the first update of a page)
+
+        Returns:
+            tuple: results() outputs with unchanged slots replaced by
+            ``no_update``, followed by the new "last-ranking" data
+        """
+        *choices, previous = args
+        # The outputs, ranking and fingerprint all come from one catalogue
+        # version, even if a reload happens during the request
+        structures = current_structures()
+        ranking, colors, outputs = recommend(
+            *choices, structures=structures, namespace=structures.cache_namespace
+        )
+        outputs = list(outputs)
+        shown = {
+            "catalogue": structures.fingerprint,
+            "ranking": ranking,
+            "colors": colors,
+        }
+        if previous is None or previous.get("catalogue") != structures.fingerprint:
+            return (*outputs, shown)
+
+        alternatives = RESULTS_COUNT - 1
+        if previous["ranking"][0] == ranking[0]:
+            # Same best phone: image and name are unchanged, and so is its
+            # table unless an indicator changed colour
+            outputs[1] = outputs[2] = no_update
+            if previous["colors"] == shown["colors"]:
+                outputs[0] = no_update
+        for slot in range(1, RESULTS_COUNT):
+            old_phone = previous["ranking"][slot : slot + 1]
+            if old_phone == ranking[slot : slot + 1]:
+                for offset in (2, 2 + alternatives, 2 + 2 * alternatives):
+                    outputs[offset + slot] = no_update
+        if previous == shown:
+            return (*outputs, no_update)
+        return (*outputs, shown)
+
+
+if DEFERRED_UPDATES:
+    app.clientside_callback(
+        ClientsideFunction(namespace="update_policy", function_name=SLIDER_UPDATE_MODE),
+        [Output(source, "data") for source in preference_sources.values()],
+        [Input(slider, "value") for slider in preference_sources],
+        State("slider-update-ms", "data"),
+        prevent_initial_call=True,
+    )
+
+
 # URL Routing Callback
 @callback(Output("page-content", "children"), [Input("url", "pathname")])
+@callback_metrics.callback("display_page")
 def display_page(pathname):
     """
     Handle URL routing to display appropriate page content.
@@ -791,11 +1453,25 @@ def display_page(pathname):
         html.Div: Page content corresponding to the requested URL
     """
     if pathname == "/home":
-        return home_page
+        return home_page()
     elif pathname == "/app":
-        return app_page
+        if CLIENTSIDE_RANKING:
+            # Ship the ranking data once per visit for the clientside callback
+            return html.Div(
+                [
+                    app_page(),
+                    dcc.Store(
+                        id="ranking-data", data=current_structures().clientside_data
+                    ),
+                ]
+            )
+        return app_page()
     else:
-        return home_page  # Default to home page for unrecognized URLs
+        return home_page()  # Default to home page for unrecognized URLs
+
+
+# Time spent importing this module (STARTUP_AUDIT=true)
+startup_audit.print_report("Import")
 
 
 # Application Entry Point
@@ -812,4 +1488,5 @@ if __name__ == "__main__":
     port = int(os.environ.get("PORT", 8050))
     debug = os.environ.get("DEBUG", "False").lower() == "true"
 
+    warm_up()
     app.run_server(host="0.0.0.0", port=port, debug=debug)  # Allow external connections
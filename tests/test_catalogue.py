@@ -0,0 +1,50 @@
+import os
+
+import pandas as pd
+import pytest
+
+from utils.catalogue import (
+    DATA_FILE,
+    DETAILS_FILE,
+    compile_catalogue,
+    load_catalogue,
+    read_compiled_catalogue,
+    read_csv_catalogue,
+)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA = os.path.join(ROOT, DATA_FILE)
+DETAILS = os.path.join(ROOT, DETAILS_FILE)
+
+
+def test_compiled_catalogue_round_trip(tmp_path):
+    path = str(tmp_path / "catalogue.bin")
+    compile_catalogue(DATA, DETAILS, path)
+    expected = read_csv_catalogue(DATA, DETAILS)
+    loaded = read_compiled_catalogue(path)
+    pd.testing.assert_frame_equal(loaded.data, expected.data)
+    pd.testing.assert_series_equal(loaded.maxima, expected.maxima, check_names=False)
+    assert list(loaded.on_card) == list(expected.on_card)
+
+
+def test_numeric_columns_are_read_only(tmp_path):
+    path = str(tmp_path / "catalogue.bin")
+    compile_catalogue(DATA, DETAILS, path)
+    values = read_compiled_catalogue(path).data["Price (Euros)"].to_numpy()
+    with pytest.raises(ValueError):
+        values[0] = 0
+
+
+def test_outdated_compiled_file_is_ignored(tmp_path):
+    data = tmp_path / "phones.csv"
+    data.write_bytes(open(DATA, "rb").read())
+    path = str(tmp_path / "catalogue.bin")
+    compile_catalogue(str(data), DETAILS, path)
+    assert load_catalogue(str(data), DETAILS, path).source == path
+
+    frame = pd.read_csv(data)
+    frame.loc[0, "average_cost"] += 1
+    frame.to_csv(data, index=False)
+    catalogue = load_catalogue(str(data), DETAILS, path)
+    assert catalogue.source == str(data)
+    assert catalogue.data["Price (Euros)"].iloc[0] == frame["average_cost"].iloc[0]
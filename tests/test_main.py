@@ -0,0 +1,71 @@
+import os
+
+import pytest
+from dash import no_update
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture(scope="module")
+def main():
+    # The app reads its data and assets relative to the repository root
+    cwd = os.getcwd()
+    os.chdir(ROOT)
+    try:
+        import main
+
+        yield main
+    finally:
+        os.chdir(cwd)
+
+
+@pytest.fixture
+def update_results(main, monkeypatch):
+    main.results_cache.clear()
+    calls = []
+    rank = main.rank
+
+    def counting_rank(*args):
+        calls.append(args)
+        return rank(*args)
+
+    monkeypatch.setattr(main, "rank", counting_rank)
+    return main.update_results.__wrapped__, calls
+
+
+def test_cache_hit_does_no_ranking(main, update_results):
+    update, calls = update_results
+    first = update(256, 8, 5000, 700, None)
+    update(256, 8, 5000, 700, None)
+    assert len(calls) == 1
+    assert first[-1]["catalogue"] == main.current_structures().fingerprint
+
+
+def test_unchanged_outputs_are_not_sent(main, update_results):
+    update, _ = update_results
+    first = update(256, 8, 5000, 700, None)
+    assert no_update not in first
+    again = update(256, 8, 5000, 700, first[-1])
+    assert all(output is no_update for output in again)
+
+
+def test_outputs_match_results(main, update_results):
+    update, _ = update_results
+    outputs = update(512, 12, 5500, 1200, None)
+    assert list(outputs[:-1]) == list(main.results(512, 12, 5500, 1200))
+
+
+def test_cache_namespace_covers_code_and_settings(main):
+    structures = main.current_structures()
+    namespace = structures.cache_namespace
+    assert structures.fingerprint in namespace
+    assert main.CODE_VERSION in namespace
+    assert main.results_cache.namespace == namespace
+
+
+def test_tooltips_show_the_card_data_without_id(main):
+    structures = main.current_structures()
+    expected = [col for col in structures.card_data.columns if col != "Id"]
+    header = structures.fragments[0].tooltip.children[0].children.children
+    assert [cell.children for cell in header] == expected
+    assert main.build_clientside_data(structures)["tooltip_columns"] == expected
@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+from utils import pareto
+from utils.pareto import FrontRanking, non_dominated_sort
+from utils.ranking import RankingEngine
+
+
+def reference_fronts(points):
+    """O(n^2) peeling of non-dominated sets."""
+    fronts = np.full(len(points), -1)
+    remaining = list(range(len(points)))
+    front = 0
+    while remaining:
+        current = [
+            i
+            for i in remaining
+            if not any(
+                (points[j] <= points[i]).all() and (points[j] < points[i]).any()
+                for j in remaining
+            )
+        ]
+        fronts[current] = front
+        remaining = [i for i in remaining if i not in current]
+        front += 1
+    return fronts
+
+
+@pytest.mark.parametrize("levels", [2, 5, 1000])
+def test_non_dominated_sort_matches_reference(levels):
+    points = np.random.default_rng(levels).integers(0, levels, size=(300, 3))
+    np.testing.assert_array_equal(non_dominated_sort(points), reference_fronts(points))
+
+
+def test_non_dominated_sort_small_blocks(monkeypatch):
+    points = np.random.default_rng(7).random((400, 4))
+    expected = reference_fronts(points)
+    monkeypatch.setattr(pareto, "BLOCK_SIZE", 16)
+    monkeypatch.setattr(pareto, "FRONT_SLICE", 3)
+    blocks = []
+    dominated_by = pareto._dominated_by
+    monkeypatch.setattr(
+        pareto,
+        "_dominated_by",
+        lambda block, front: blocks.append(len(block)) or dominated_by(block, front),
+    )
+    np.testing.assert_array_equal(non_dominated_sort(points), expected)
+    assert max(blocks) == 16
+
+
+def test_non_dominated_sort_stops_early():
+    points = np.random.default_rng(3).integers(0, 6, size=(300, 3))
+    expected = reference_fronts(points)
+    fronts = non_dominated_sort(points, min_count=10)
+    last = fronts.max()
+    exact = fronts < last
+    assert exact.sum() >= 10
+    np.testing.assert_array_equal(fronts[exact], expected[exact])
+    assert (expected[~exact] >= last).all()
+
+
+def test_front_ranking_orders_by_front_then_distance():
+    rng = np.random.default_rng(5)
+    values = rng.integers(0, 5, size=(200, 4))
+    engine = RankingEngine(values, [-1, -1, -1, 1])
+    ranking = FrontRanking(engine, 5)
+    fronts = reference_fronts(-engine.matrix)
+    for aspirations in rng.integers(0, 5, size=(20, 4)):
+        distance = engine.distances(aspirations)
+        expected = np.lexsort((np.arange(len(values)), distance, fronts))[:5]
+        np.testing.assert_array_equal(ranking.top_k(aspirations, 5), expected)
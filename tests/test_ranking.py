@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from utils.ranking import RankingEngine, top_k_from_distances
+
+DIRECTIONS = [-1, -1, -1, 1]
+
+
+def tied_values(n, seed=0):
+    """Criteria on a coarse integer grid, so many phones are tied."""
+    return np.random.default_rng(seed).integers(0, 4, size=(n, 4))
+
+
+@pytest.mark.parametrize("k", [1, 5, 20, 100])
+def test_top_k_from_distances_matches_stable_sort(k):
+    distance = np.random.default_rng(1).integers(0, 5, size=50).astype(float)
+    expected = np.argsort(distance, kind="stable")[:k]
+    np.testing.assert_array_equal(top_k_from_distances(distance, k), expected)
+
+
+def test_top_k_from_distances_empty():
+    assert top_k_from_distances(np.zeros(3), 0).size == 0
+
+
+def test_normalized_matrix_is_flipped_to_maximization():
+    engine = RankingEngine([[1, 1, 1, 10], [3, 2, 5, 20]], DIRECTIONS)
+    np.testing.assert_array_equal(engine.matrix, [[0, 0, 0, 1], [1, 1, 1, 0]])
+
+
+def test_constant_criterion_does_not_divide_by_zero():
+    engine = RankingEngine([[1, 2, 3, 4], [1, 5, 6, 7]], DIRECTIONS)
+    assert np.isfinite(engine.matrix).all()
+    np.testing.assert_array_equal(engine.matrix[:, 0], [0, 0])
+
+
+@pytest.mark.parametrize("k", [1, 5, 300])
+def test_top_k_matches_full_order(k):
+    engine = RankingEngine(tied_values(200), DIRECTIONS)
+    for aspirations in tied_values(20, seed=2):
+        np.testing.assert_array_equal(
+            engine.top_k(aspirations, k), engine.order(aspirations)[:k]
+        )
+
+
+def test_top_k_batch_matches_top_k():
+    engine = RankingEngine(tied_values(200), DIRECTIONS)
+    aspirations = tied_values(50, seed=3)
+    batch = engine.top_k_batch(aspirations, 5, max_bytes=4096)
+    for row, values in zip(batch, aspirations):
+        np.testing.assert_array_equal(row, engine.top_k(values, 5))
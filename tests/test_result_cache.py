@@ -0,0 +1,92 @@
+import os
+import stat
+import tempfile
+import time
+
+import pytest
+
+from utils.result_cache import ResultCache, create_backend
+
+
+@pytest.fixture(params=["memory", "filesystem", "sqlite"])
+def make_backend(request, tmp_path):
+    def make(**options):
+        path = tmp_path / ("entries" if request.param == "filesystem" else "db")
+        return create_backend(request.param, path=str(path), **options)
+
+    return make
+
+
+def test_memoize_rounds_keys_and_counts():
+    cache = ResultCache(maxsize=2)
+    calls = []
+
+    @cache.memoize
+    def double(*choices):
+        calls.append(choices)
+        return [2 * c for c in choices]
+
+    assert double(1.2, 2.6) == [2, 6]
+    assert double(0.8, 3.4) == [2, 6]
+    assert calls == [(1, 3)]
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_memoize_evicts_least_recently_used():
+    cache = ResultCache(maxsize=2)
+    calls = []
+    square = cache.memoize(lambda x: calls.append(x) or x * x)
+    square(1)
+    square(2)
+    square(1)
+    square(3)
+    square(1)
+    square(2)
+    assert calls == [1, 2, 3, 2]
+
+
+def test_get_set_and_size_bound(make_backend):
+    backend = make_backend(maxsize=3)
+    for i in range(5):
+        backend.set(("ns", (i,)), i)
+    assert len(backend) == 3
+    assert backend.get(("ns", (4,))) == (True, 4)
+    assert backend.get(("ns", (0,)))[0] is False
+
+
+def test_ttl_is_not_extended_by_hits(make_backend):
+    backend = make_backend(ttl=0.3)
+    backend.set("key", 1)
+    deadline = time.time() + 0.6
+    while time.time() < deadline and backend.get("key")[0]:
+        time.sleep(0.05)
+    assert backend.get("key") == (False, None)
+
+
+def test_switch_namespace_keeps_shared_entries(make_backend):
+    backend = make_backend()
+    cache = ResultCache(backend=backend)
+    cache.set((1,), "old")
+    cache.switch_namespace("new")
+    assert cache.get((1,)) == (False, None)
+    assert cache.get((1,), namespace="")[0] is backend.shared
+
+
+def test_failed_filesystem_store_is_skipped(tmp_path):
+    directory = tmp_path / "entries"
+    backend = create_backend("filesystem", path=str(directory))
+    directory.rmdir()
+    backend.set("key", 1)
+    assert backend.skipped == 1
+    assert not directory.exists()
+
+
+def test_default_shared_path_is_private(tmp_path, monkeypatch):
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+    backend = create_backend("sqlite")
+    directory = os.path.dirname(backend.path)
+    assert stat.S_IMODE(os.stat(directory).st_mode) == 0o700
+
+    os.chmod(directory, 0o777)
+    with pytest.raises(PermissionError):
+        create_backend("filesystem")
@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.ranking import RankingEngine
+from utils.spatial_index import IndexedRankingEngine, ranking_engine
+
+DIRECTIONS = [-1, -1, -1, 1]
+
+
+@pytest.mark.parametrize("levels", [3, 1000])
+@pytest.mark.parametrize("k", [1, 5, 50])
+def test_tree_matches_brute_force(levels, k):
+    rng = np.random.default_rng(levels)
+    values = rng.integers(0, levels, size=(500, 4))
+    aspirations = rng.integers(0, levels, size=(40, 4))
+    brute = RankingEngine(values, DIRECTIONS)
+    tree = IndexedRankingEngine(values, DIRECTIONS, leaf_size=8)
+    np.testing.assert_array_equal(
+        tree.top_k_batch(aspirations, k), brute.top_k_batch(aspirations, k)
+    )
+    for values in aspirations:
+        np.testing.assert_array_equal(tree.top_k(values, k), brute.top_k(values, k))
+
+
+def test_tree_with_k_above_catalogue_size():
+    values = np.arange(12).reshape(3, 4)
+    tree = IndexedRankingEngine(values, DIRECTIONS)
+    np.testing.assert_array_equal(
+        tree.top_k(values[1], 10),
+        RankingEngine(values, DIRECTIONS).top_k(values[1], 10),
+    )
+
+
+def test_ranking_engine_backends():
+    frame = pd.DataFrame(np.arange(40).reshape(10, 4), columns=list("abcd"))
+    columns = dict(zip("abcd", DIRECTIONS))
+    assert type(ranking_engine(frame, columns, "brute")) is RankingEngine
+    assert type(ranking_engine(frame, columns, "tree")) is IndexedRankingEngine
+    # Small catalogues stay on brute force without timing anything
+    assert type(ranking_engine(frame, columns, "auto")) is RankingEngine
+    assert type(ranking_engine(frame, columns, "auto", threshold=5)) is (
+        IndexedRankingEngine
+    )
+    with pytest.raises(ValueError):
+        ranking_engine(frame, columns, "ball")
@@ -0,0 +1,107 @@
+"""
+Content-hashed URLs for the files in the Dash assets folder.
+
+Each asset URL carries a hash of the file content, as in
+``/assets/images/1.jpg?v=<hash>``, so the URL only changes when the file does.
+Responses for a URL whose hash matches the current file are marked as immutable
+with a one year lifetime, so browsers and proxies serve repeat visits from their
+cache.
+"""
+
+import hashlib
+import os
+import threading
+
+import flask
+
+# Lifetime of fingerprinted asset responses (1 year)
+IMMUTABLE_MAX_AGE = 31536000
+
+
+class AssetFingerprints:
+    """
+    Content hashes of the files in an assets folder.
+
+    Hashes are computed on first use and recomputed when a file's size or
+    modification time changes, so updated assets get new URLs.
+
+    Args:
+        folder: Path of the assets folder
+        length: Number of hex digits of the SHA-256 hash kept
+    """
+
+    def __init__(self, folder, length=12):
+        self.folder = folder
+        self.length = length
+        self._hashes = {}
+        self._lock = threading.Lock()
+
+    def fingerprint(self, path):
+        """
+        Return the content hash of an asset.
+
+        Args:
+            path: Path relative to the assets folder, with forward slashes
+
+        Returns:
+            str or None: Hash, or None if the file does not exist
+        """
+        full_path = os.path.join(self.folder, *path.split("/"))
+        try:
+            stat = os.stat(full_path)
+        except OSError:
+            return None
+        signature = (stat.st_size, stat.st_mtime_ns)
+
+        cached = self._hashes.get(path)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        digest = hashlib.sha256()
+        with open(full_path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 16), b""):
+                digest.update(block)
+        value = digest.hexdigest()[: self.length]
+        with self._lock:
+            self._hashes[path] = (signature, value)
+        return value
+
+    def url(self, app, path):
+        """
+        Return the fingerprinted URL of an asset.
+
+        Args:
+            app: Dash application serving the assets
+            path: Path relative to the assets folder
+
+        Returns:
+            str: Asset URL, with ``?v=<hash>`` if the file exists
+        """
+        fingerprint = self.fingerprint(path)
+        url = app.get_asset_url(path)
+        return f"{url}?v={fingerprint}" if fingerprint else url
+
+    def install(self, app):
+        """
+        Add long-lived cache headers to fingerprinted asset responses.
+
+        Args:
+            app: Dash application serving the assets
+        """
+        prefix = app.get_asset_url("")
+
+        @app.server.after_request
+        def cache_fingerprinted_assets(response):
+            request = flask.request
+            version = request.args.get("v")
+            if (
+                version
+                and request.path.startswith(prefix)
+                and response.status_code in (200, 304)
+                and version == self.fingerprint(request.path[len(prefix) :])
+            ):
+                response.cache_control.no_cache = None
+                response.cache_control.public = True
+                response.cache_control.max_age = IMMUTABLE_MAX_AGE
+                response.cache_control.immutable = True
+            return response
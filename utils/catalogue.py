@@ -0,0 +1,400 @@
+"""
+Loading of the phone catalogue.
+
+The catalogue is defined by two CSV files: the phone dataset, and a details
+file whose rows hold the display name of each column, its value for the
+fitness normalization, and whether it is shown on the result cards. This
+module is the only place where that layout is parsed.
+
+For a fast start, ``compile_catalogue`` converts both files into one binary
+columnar file: a JSON header with the metadata, followed by one aligned array
+per column. ``load_catalogue`` memory-maps the numeric columns of that file
+instead of parsing the CSVs, so their pages come from the page cache and are
+shared by every worker (and every container on the host) that maps the file.
+The compiled file records hashes of its sources and is ignored when it is
+missing or outdated.
+
+Compile with::
+
+    python -m utils.catalogue [data_csv] [details_csv] [output_file]
+
+``CatalogueWatcher`` polls the files so that a running server can reload the
+catalogue when they change.
+
+Numeric columns are read-only in both cases. When Gunicorn preloads the app
+(``PRELOAD=true``), the master process loads the catalogue before forking, and
+the workers share those pages copy-on-write. Marking them read-only makes any
+accidental in-place write fail loudly instead of silently copying the pages
+into every worker.
+"""
+
+import hashlib
+import json
+import os
+import struct
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+DATA_FILE = os.path.join("data", "Phones_2025.csv")
+DETAILS_FILE = os.path.join("data", "Phone_details.csv")
+COMPILED_FILE = os.path.join("build", "catalogue.bin")
+
+# File signature and format version of the compiled catalogue
+MAGIC = b"PHONECAT"
+VERSION = 1
+
+# Column arrays start at multiples of this many bytes
+ALIGNMENT = 64
+
+# Rows of the details file, after the header row of raw column names
+_NAMES_ROW = 0
+_MAXIMA_ROW = 1
+_ON_CARD_ROW = 2
+
+
+class Catalogue:
+    """
+    Phone dataset with the metadata of its columns.
+
+    Args:
+        data: DataFrame with one row per phone and display column names
+        maxima: Series with the normalization value of each column
+        on_card: Columns whose values are shown on the result cards
+        source: Path of the file the catalogue was loaded from
+    """
+
+    def __init__(self, data, maxima, on_card, source=None):
+        self.data = data
+        self.maxima = maxima
+        self.on_card = on_card
+        self.source = source
+
+    def __len__(self):
+        return len(self.data)
+
+
+def freeze_frame(frame):
+    """
+    Rebuild a DataFrame with read-only numeric columns.
+
+    Each column keeps its own block, so the arrays are not copied again when
+    the frame is consolidated.
+
+    Args:
+        frame: DataFrame to freeze
+
+    Returns:
+        pd.DataFrame: Frame with the same columns and index, whose numeric
+        columns are backed by read-only arrays
+    """
+    columns = {}
+    for name, column in frame.items():
+        values = column.to_numpy(copy=True)
+        # Object columns hold references to Python objects, whose reference
+        # counts change on every access; only numeric data can stay shared
+        if values.dtype != object:
+            values.setflags(write=False)
+        columns[name] = values
+    return pd.DataFrame(columns, index=frame.index, copy=False)
+
+
+def read_csv_catalogue(data_path=DATA_FILE, details_path=DETAILS_FILE):
+    """
+    Parse the phone dataset and its details configuration.
+
+    Args:
+        data_path: CSV file with one row per phone
+        details_path: CSV file with the column names, maximum values and card
+            flags
+
+    Returns:
+        Catalogue: Catalogue with read-only numeric columns
+    """
+    return catalogue_from_frames(
+        pd.read_csv(data_path, header=0),
+        pd.read_csv(details_path, header=0),
+        source=data_path,
+    )
+
+
+def catalogue_from_frames(data, details, source=None):
+    """
+    Build a catalogue from the parsed phone dataset and details configuration.
+
+    Args:
+        data: DataFrame with one row per phone and the raw column names
+        details: DataFrame of the details file
+        source: Path the data was read from
+
+    Returns:
+        Catalogue: Catalogue with read-only numeric columns
+    """
+    # Rename columns in both datasets using the names in the first row
+    names = details.loc[_NAMES_ROW]
+    data = data.rename(columns=names)
+    details = details.rename(columns=names)
+
+    on_card = details.loc[_ON_CARD_ROW].astype(int)
+    return Catalogue(
+        freeze_frame(data),
+        maxima=details.loc[_MAXIMA_ROW].astype(int),
+        on_card=details.columns[on_card == 1],
+        source=source,
+    )
+
+
+def _file_digest(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _source_digests(data_path, details_path):
+    return {
+        "data": _file_digest(data_path),
+        "details": _file_digest(details_path),
+    }
+
+
+def compile_catalogue(
+    data_path=DATA_FILE, details_path=DETAILS_FILE, output_path=COMPILED_FILE
+):
+    """
+    Write the catalogue and its metadata to a binary columnar file.
+
+    Text columns are stored as fixed-width Unicode arrays and turned back into
+    Python strings when loaded; numeric columns are memory-mapped as stored.
+
+    Args:
+        data_path: CSV file with one row per phone
+        details_path: CSV file with the column metadata
+        output_path: Compiled file to write
+
+    Returns:
+        int: Size of the written file in bytes
+    """
+    catalogue = read_csv_catalogue(data_path, details_path)
+    arrays = []
+    for name, column in catalogue.data.items():
+        values = column.to_numpy()
+        if values.dtype == object:
+            values = values.astype(str)
+        arrays.append((name, np.ascontiguousarray(values)))
+
+    columns = []
+    offset = 0
+    for name, values in arrays:
+        offset += -offset % ALIGNMENT
+        columns.append({"name": name, "dtype": values.dtype.str, "offset": offset})
+        offset += values.nbytes
+    header = {
+        "version": VERSION,
+        "rows": len(catalogue),
+        "sources": _source_digests(data_path, details_path),
+        "maxima": catalogue.maxima.tolist(),
+        "on_card": list(catalogue.on_card),
+        "columns": columns,
+    }
+    header_bytes = json.dumps(header).encode()
+    # Column offsets are relative to the aligned end of the header
+    start = len(MAGIC) + 8 + len(header_bytes)
+    start += -start % ALIGNMENT
+
+    folder = os.path.dirname(output_path) or "."
+    os.makedirs(folder, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=folder, suffix=".tmp")
+    with os.fdopen(fd, "wb") as f:
+        f.write(MAGIC + struct.pack("<Q", len(header_bytes)) + header_bytes)
+        for (_, values), column in zip(arrays, columns):
+            f.seek(start + column["offset"])
+            f.write(values.tobytes())
+        size = f.tell()
+    os.chmod(tmp_path, 0o644)
+    os.replace(tmp_path, output_path)
+    return size
+
+
+def read_compiled_header(path):
+    """
+    Read the header of a compiled catalogue file.
+
+    Args:
+        path: Compiled catalogue file
+
+    Returns:
+        tuple: (header dict, byte offset of the column data)
+
+    Raises:
+        ValueError: If the file is not a compiled catalogue of this version
+    """
+    with open(path, "rb") as f:
+        prefix = f.read(len(MAGIC) + 8)
+        if len(prefix) < len(MAGIC) + 8 or not prefix.startswith(MAGIC):
+            raise ValueError(f"{path} is not a compiled catalogue")
+        (length,) = struct.unpack("<Q", prefix[len(MAGIC) :])
+        header = json.loads(f.read(length))
+    if header.get("version") != VERSION:
+        raise ValueError(f"{path} has unsupported version {header.get('version')}")
+    start = len(MAGIC) + 8 + length
+    return header, start + -start % ALIGNMENT
+
+
+def read_compiled_catalogue(path=COMPILED_FILE):
+    """
+    Load a compiled catalogue, memory-mapping its numeric columns.
+
+    Args:
+        path: Compiled catalogue file
+
+    Returns:
+        Catalogue: Catalogue whose numeric columns are read-only memory maps
+    """
+    header, start = read_compiled_header(path)
+    rows = header["rows"]
+    columns = {}
+    for column in header["columns"]:
+        dtype = np.dtype(column["dtype"])
+        values = np.memmap(
+            path, dtype=dtype, mode="r", offset=start + column["offset"], shape=rows
+        )
+        if dtype.kind == "U":
+            values = values.astype(object)
+        else:
+            # Plain ndarray view of the read-only mapping, for pandas
+            values = values.view(np.ndarray)
+        columns[column["name"]] = values
+    data = pd.DataFrame(columns, copy=False)
+    names = list(data.columns)
+    return Catalogue(
+        data,
+        maxima=pd.Series(header["maxima"], index=names),
+        on_card=pd.Index(header["on_card"]),
+        source=path,
+    )
+
+
+def load_catalogue(
+    data_path=DATA_FILE, details_path=DETAILS_FILE, compiled_path=COMPILED_FILE
+):
+    """
+    Load the catalogue from its compiled file if it is up to date, else from CSV.
+
+    Args:
+        data_path: CSV file with one row per phone
+        details_path: CSV file with the column metadata
+        compiled_path: Compiled catalogue file, or None to always parse the CSVs
+
+    Returns:
+        Catalogue: Loaded catalogue
+    """
+    if compiled_path and os.path.exists(compiled_path):
+        try:
+            header, _ = read_compiled_header(compiled_path)
+            if header["sources"] == _source_digests(data_path, details_path):
+                return read_compiled_catalogue(compiled_path)
+            print(f"{compiled_path} is outdated, reading {data_path}")
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Could not read {compiled_path} ({e}), reading {data_path}")
+    return read_csv_catalogue(data_path, details_path)
+
+
+class CatalogueWatcher:
+    """
+    Poll the catalogue files and call back when they change.
+
+    A change is reported once the files have kept the same size and
+    modification time for one more polling interval, so a file that is still
+    being written is not loaded half-way. The callback runs on the watcher
+    thread; if it raises, the error is printed and the change is retried at
+    the next modification.
+
+    The polling thread does not survive a fork, so ``start`` is meant to be
+    called from the process serving requests (it is a no-op if the thread is
+    already running in this process).
+
+    Args:
+        paths: Files to watch (missing files are watched for creation)
+        on_change: Function called without arguments after a change
+        interval: Seconds between polls
+    """
+
+    def __init__(self, paths, on_change, interval=5.0):
+        self.paths = [path for path in paths if path]
+        self.on_change = on_change
+        self.interval = interval
+        self._signature = self.signature()
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def signature(self):
+        """
+        Return the size and modification time of the watched files.
+
+        Returns:
+            tuple: (size, mtime_ns) per file, or None for missing files
+        """
+        signature = []
+        for path in self.paths:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                signature.append(None)
+            else:
+                signature.append((stat.st_size, stat.st_mtime_ns))
+        return tuple(signature)
+
+    def start(self):
+        """
+        Start the polling thread in the current process if it is not running.
+        """
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+        threading.Thread(
+            target=self._run, name="catalogue-watcher", daemon=True
+        ).start()
+
+    def poll(self, pending=None):
+        """
+        Check the files once.
+
+        Args:
+            pending: Signature seen at the previous poll that was not yet
+                reported, if any
+
+        Returns:
+            tuple or None: Signature of an unreported change, to pass to the
+            next poll
+        """
+        current = self.signature()
+        if current == self._signature:
+            return None
+        if current != pending:
+            # Changed since the last poll: wait until the files are stable
+            return current
+        try:
+            self.on_change()
+        except Exception as e:  # Keep serving the previous catalogue
+            print(f"Catalogue reload failed: {e!r}")
+        self._signature = current
+        return None
+
+    def _run(self):
+        pending = None
+        while True:
+            time.sleep(self.interval)
+            pending = self.poll(pending)
+
+
+if __name__ == "__main__":
+    paths = sys.argv[1:4]
+    output = paths[2] if len(paths) > 2 else COMPILED_FILE
+    size = compile_catalogue(*paths)
+    print(f"Wrote {size / 1024:.1f} KiB catalogue to {output}")
@@ -0,0 +1,197 @@
+"""
+Resized and WebP variants of the phone images.
+
+The result cards show the phone images at a few hundred pixels, but the
+originals are larger. This module writes downscaled JPEG and WebP copies of
+each image to ``assets/derived/`` at fixed widths, so the cards can reference
+them through ``srcset`` and browsers download only the size they need.
+
+Building is incremental: a variant is only (re)written when it is missing or
+older than its source. The width of each source is recorded next to its
+variants, so an image is known to be up to date without opening it. Files are
+written to a temporary name and renamed, so other workers never serve a
+partial file. Run it offline with::
+
+    python -m utils.image_derivatives [assets_folder]
+
+Pillow is only needed to build the variants, and only imported when a variant
+is missing or outdated; without it (or without the built files) the app keeps
+serving the originals.
+"""
+
+import glob
+import os
+import sys
+import tempfile
+
+# Widths (in pixels) of the generated variants; covers the 200px alternative
+# cards and the best-phone image at 1x and 2x pixel density
+DERIVATIVE_WIDTHS = (200, 400, 640)
+
+# File extension -> Pillow format and save options
+DERIVATIVE_FORMATS = {
+    "webp": ("WEBP", {"quality": 80, "method": 6}),
+    "jpg": ("JPEG", {"quality": 82, "optimize": True, "progressive": True}),
+}
+
+DERIVED_FOLDER = "derived"
+
+
+def derivative_path(path, width, extension):
+    """
+    Path of a variant, relative to the assets folder.
+
+    Args:
+        path: Source image path relative to the assets folder, e.g. "images/1.jpg"
+        width: Variant width in pixels
+        extension: Variant file extension ("webp" or "jpg")
+
+    Returns:
+        str: e.g. "derived/images/1-200.webp"
+    """
+    stem = os.path.splitext(path)[0]
+    return f"{DERIVED_FOLDER}/{stem}-{width}.{extension}"
+
+
+def target_widths(source_width):
+    """
+    Widths to generate for an image, without upscaling.
+
+    Args:
+        source_width: Width of the original image
+
+    Returns:
+        list: Variant widths smaller than the original
+    """
+    return [width for width in DERIVATIVE_WIDTHS if width < source_width]
+
+
+def _local_path(assets_folder, path):
+    """Filesystem path of a path relative to the assets folder."""
+    return os.path.join(assets_folder, *path.split("/"))
+
+
+def _width_path(path):
+    """Path of the file recording the width of a source image."""
+    return f"{DERIVED_FOLDER}/{os.path.splitext(path)[0]}.width"
+
+
+def _write_atomically(target, write):
+    """Call ``write`` with a temporary path, then rename it to ``target``."""
+    folder = os.path.dirname(target)
+    os.makedirs(folder, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(
+        dir=folder, suffix=os.path.splitext(target)[1] + ".tmp"
+    )
+    os.close(fd)
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, target)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+def _up_to_date(assets_folder, path, source_mtime):
+    """Whether the variants of an image for its recorded width are all newer."""
+    width_file = _local_path(assets_folder, _width_path(path))
+    try:
+        if os.path.getmtime(width_file) < source_mtime:
+            return False
+        with open(width_file) as f:
+            source_width = int(f.read())
+        for width in target_widths(source_width):
+            for extension in DERIVATIVE_FORMATS:
+                target = _local_path(
+                    assets_folder, derivative_path(path, width, extension)
+                )
+                if os.path.getmtime(target) < source_mtime:
+                    return False
+    except (OSError, ValueError):
+        return False
+    return True
+
+
+def build_derivatives(assets_folder, pattern="images/*.jpg"):
+    """
+    Write missing or outdated variants of the matching images.
+
+    Args:
+        assets_folder: Path of the Dash assets folder
+        pattern: Glob of the source images, relative to the assets folder
+
+    Returns:
+        int: Number of variant files written
+    """
+    written = 0
+    for source in sorted(glob.glob(os.path.join(assets_folder, pattern))):
+        path = os.path.relpath(source, assets_folder).replace(os.sep, "/")
+        source_mtime = os.path.getmtime(source)
+        if _up_to_date(assets_folder, path, source_mtime):
+            continue
+        # Imported only when there is something to build
+        from PIL import Image
+
+        with Image.open(source) as image:
+            image = image.convert("RGB")
+            for width in target_widths(image.width):
+                resized = None
+                for extension, (fmt, options) in DERIVATIVE_FORMATS.items():
+                    target = _local_path(
+                        assets_folder, derivative_path(path, width, extension)
+                    )
+                    if (
+                        os.path.exists(target)
+                        and os.path.getmtime(target) >= source_mtime
+                    ):
+                        continue
+                    if resized is None:
+                        height = round(image.height * width / image.width)
+                        resized = image.resize((width, height), Image.LANCZOS)
+                    _write_atomically(
+                        target,
+                        lambda tmp_path: resized.save(tmp_path, fmt, **options),
+                    )
+                    written += 1
+            source_width = image.width
+
+        # Recorded last, once every variant of the image is in place
+        def write_width(tmp_path):
+            with open(tmp_path, "w") as f:
+                f.write(str(source_width))
+
+        _write_atomically(_local_path(assets_folder, _width_path(path)), write_width)
+    return written
+
+
+def available_variants(assets_folder, path):
+    """
+    List the built variants of an image.
+
+    Args:
+        assets_folder: Path of the Dash assets folder
+        path: Source image path relative to the assets folder
+
+    Returns:
+        dict: Extension -> list of (variant path, width), smallest first; empty
+        if no variants were built
+    """
+    variants = {}
+    for extension in DERIVATIVE_FORMATS:
+        found = [
+            (derivative_path(path, width, extension), width)
+            for width in DERIVATIVE_WIDTHS
+            if os.path.exists(
+                _local_path(assets_folder, derivative_path(path, width, extension))
+            )
+        ]
+        if found:
+            variants[extension] = found
+    return variants
+
+
+if __name__ == "__main__":
+    folder = sys.argv[1] if len(sys.argv) > 1 else "assets"
+    print(
+        f"Wrote {build_derivatives(folder)} image variants to {folder}/{DERIVED_FOLDER}"
+    )
@@ -0,0 +1,143 @@
+"""
+Memory usage of the server processes.
+
+With Gunicorn preloading the app, the master process imports the libraries and
+loads the catalogue before forking, so the workers start out sharing all of
+those pages copy-on-write. The resident set size (RSS) of a worker counts the
+shared pages too, so it overstates what each extra worker costs. This module
+reads the proportional (PSS) and unique (USS) set sizes from
+``/proc/<pid>/smaps_rollup``: USS is the memory a worker adds, and the PSS of
+all processes sums to the memory the pod actually uses.
+
+Print a report for a Gunicorn master and its workers with::
+
+    python -m utils.memory [master_pid]
+
+In the container the master is process 1, the default.
+
+The values are only available on Linux; elsewhere ``process_memory`` returns
+None.
+"""
+
+import gc
+import os
+import sys
+
+# Fields of smaps_rollup, in kB
+_SMAPS_FIELDS = (
+    "Rss",
+    "Pss",
+    "Shared_Clean",
+    "Shared_Dirty",
+    "Private_Clean",
+    "Private_Dirty",
+)
+
+
+def process_memory(pid="self"):
+    """
+    Read the memory usage of a process.
+
+    Args:
+        pid: Process id, or "self" for the current process
+
+    Returns:
+        dict or None: Sizes in bytes ("rss", "pss", "uss", "shared"), or None if
+        they cannot be read
+    """
+    fields = {}
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            for line in f:
+                name, _, value = line.partition(":")
+                if name in _SMAPS_FIELDS:
+                    fields[name] = int(value.split()[0]) * 1024
+    except (OSError, ValueError):
+        return None
+    if len(fields) != len(_SMAPS_FIELDS):
+        return None
+    return {
+        "rss": fields["Rss"],
+        "pss": fields["Pss"],
+        "uss": fields["Private_Clean"] + fields["Private_Dirty"],
+        "shared": fields["Shared_Clean"] + fields["Shared_Dirty"],
+    }
+
+
+def child_pids(pid):
+    """
+    List the child processes of a process (e.g. the workers of a master).
+
+    Args:
+        pid: Parent process id
+
+    Returns:
+        list: Child process ids, sorted
+    """
+    children = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                # The command name may contain spaces; fields follow the ")"
+                ppid = int(f.read().rpartition(")")[2].split()[1])
+        except (OSError, ValueError, IndexError):
+            continue
+        if ppid == int(pid):
+            children.append(int(entry))
+    return sorted(children)
+
+
+def format_memory(usage):
+    """
+    Format a memory usage dict for the logs.
+
+    Args:
+        usage: Dict returned by ``process_memory``, or None
+
+    Returns:
+        str: e.g. "rss=120.3MiB pss=48.1MiB uss=20.7MiB shared=99.6MiB"
+    """
+    if usage is None:
+        return "memory usage unavailable"
+    return " ".join(f"{name}={value / 2**20:.1f}MiB" for name, value in usage.items())
+
+
+def memory_report(master_pid):
+    """
+    Build a per-process memory report for a master and its workers.
+
+    Args:
+        master_pid: Process id of the Gunicorn master
+
+    Returns:
+        str: One line per process, plus the total PSS (the pod's actual usage)
+    """
+    lines = []
+    total_pss = 0
+    for role, pid in [("master", master_pid)] + [
+        ("worker", child) for child in child_pids(master_pid)
+    ]:
+        usage = process_memory(pid)
+        total_pss += usage["pss"] if usage else 0
+        lines.append(f"{role} {pid}: {format_memory(usage)}")
+    lines.append(f"total pss={total_pss / 2**20:.1f}MiB")
+    return "\n".join(lines)
+
+
+def freeze_heap():
+    """
+    Move all objects allocated so far out of the garbage collector's reach.
+
+    Called in the master right before forking: the collector would otherwise
+    write to the header of every tracked object on its first full collection in
+    each worker, copying the preloaded heap pages one by one.
+    """
+    gc.collect()
+    if hasattr(gc, "freeze"):
+        gc.freeze()
+
+
+if __name__ == "__main__":
+    print(memory_report(int(sys.argv[1]) if len(sys.argv) > 1 else 1))
@@ -0,0 +1,413 @@
+"""
+Latency and traffic metrics of the Dash callbacks, in Prometheus text format.
+
+Each request to the Dash callback endpoint is timed and broken down into
+phases that add up to the request duration:
+
+- ranking: ordering the phones by distance to the aspirations
+- components: the rest of the callback (building or looking up the result
+  components, comparing with the previous ranking)
+- serialization: everything outside the callback, mostly Dash encoding the
+  outputs to JSON and the response being built
+
+Request counts by status and response sizes are recorded as well, and extra
+values (e.g. the result cache counters) can be added at scrape time by
+collectors. ``install`` exposes everything on a ``/metrics`` route.
+
+Metrics are kept per process. When a directory is configured, every process
+writes its values there (from a background thread every ``flush_interval``
+seconds after a change, and on each scrape) and ``/metrics`` reports the sum over all processes, so a scrape
+that reaches any Gunicorn worker sees the whole pod.
+"""
+
+import bisect
+import contextlib
+import functools
+import glob
+import json
+import os
+import tempfile
+import threading
+import time
+
+import flask
+
+# Histogram buckets (upper bounds) of the latencies, in seconds
+LATENCY_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+)
+
+# Histogram buckets of the response sizes, in bytes
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+CALLBACK_PATH = "_dash-update-component"
+
+
+class MetricsRegistry:
+    """
+    Thread-safe store of counters, gauges and histograms.
+
+    Args:
+        prefix: Prefix of every metric name
+    """
+
+    def __init__(self, prefix="phone_selector"):
+        self.prefix = prefix
+        self.definitions = {}
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def define(self, name, kind, help_text, buckets=None, ratio=None):
+        """
+        Declare a metric.
+
+        Args:
+            name: Metric name, without the prefix
+            kind: "counter", "gauge" or "histogram"
+            help_text: Description shown in the exposition
+            buckets: Upper bounds of the histogram buckets
+            ratio: For a gauge computed when rendering, the names of two
+                metrics (a, b) whose summed values give the gauge as a / (a + b)
+        """
+        self.definitions[name] = {
+            "kind": kind,
+            "help": help_text,
+            "buckets": list(buckets) if buckets else None,
+            "ratio": ratio,
+        }
+
+    def _key(self, name, labels):
+        return (name, tuple(sorted(labels.items())))
+
+    def inc(self, name, value=1.0, **labels):
+        """Add to a counter."""
+        key = self._key(name, labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + value
+
+    def set(self, name, value, **labels):
+        """Set a gauge, or a counter whose value is kept elsewhere."""
+        with self._lock:
+            self._values[self._key(name, labels)] = float(value)
+
+    def observe(self, name, value, **labels):
+        """Record a value in a histogram."""
+        buckets = self.definitions[name]["buckets"]
+        key = self._key(name, labels)
+        with self._lock:
+            # Per-bucket counts (last one is +Inf), then sum and count
+            series = self._values.get(key)
+            if series is None:
+                series = self._values[key] = [0] * (len(buckets) + 1) + [0.0, 0]
+            series[bisect.bisect_left(buckets, value)] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def snapshot(self):
+        """
+        Return the current values in a JSON-able form.
+
+        Returns:
+            list: [name, labels, value] entries; histogram values are lists
+        """
+        with self._lock:
+            return [
+                [name, dict(labels), list(value) if isinstance(value, list) else value]
+                for (name, labels), value in self._values.items()
+            ]
+
+    def render(self, snapshots):
+        """
+        Format the sum of snapshots in the Prometheus text format.
+
+        Args:
+            snapshots: Lists returned by ``snapshot`` (e.g. one per process)
+
+        Returns:
+            str: Exposition text
+        """
+        merged = {}
+        for snapshot in snapshots:
+            for name, labels, value in snapshot:
+                if name not in self.definitions:
+                    continue
+                key = self._key(name, labels)
+                if isinstance(value, list):
+                    previous = merged.get(key, [0] * len(value))
+                    merged[key] = [a + b for a, b in zip(previous, value)]
+                else:
+                    merged[key] = merged.get(key, 0.0) + value
+        for name, definition in self.definitions.items():
+            if definition["ratio"]:
+                numerator, other = definition["ratio"]
+                for (key, labels), value in list(merged.items()):
+                    if key == numerator:
+                        total = value + merged.get((other, labels), 0.0)
+                        merged[(name, labels)] = value / total if total else 0.0
+
+        lines = []
+        for name, definition in self.definitions.items():
+            full_name = f"{self.prefix}_{name}"
+            series = sorted(
+                (labels, value)
+                for (key, labels), value in merged.items()
+                if key == name
+            )
+            if not series:
+                continue
+            lines.append(f"# HELP {full_name} {definition['help']}")
+            lines.append(f"# TYPE {full_name} {definition['kind']}")
+            for labels, value in series:
+                if definition["kind"] != "histogram":
+                    lines.append(f"{full_name}{_labels(labels)} {_number(value)}")
+                    continue
+                cumulative = 0
+                bounds = definition["buckets"] + ["+Inf"]
+                for bound, count in zip(bounds, value):
+                    cumulative += count
+                    le = labels + (("le", _number(bound)),)
+                    lines.append(f"{full_name}_bucket{_labels(le)} {cumulative}")
+                lines.append(f"{full_name}_sum{_labels(labels)} {_number(value[-2])}")
+                lines.append(f"{full_name}_count{_labels(labels)} {value[-1]}")
+        return "\n".join(lines) + "\n"
+
+
+def _labels(labels):
+    if not labels:
+        return ""
+    pairs = ",".join(
+        '{}="{}"'.format(k, str(v).replace("\\", "\\\\").replace('"', '\\"'))
+        for k, v in labels
+    )
+    return "{" + pairs + "}"
+
+
+def _number(value):
+    if isinstance(value, str):
+        return value
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class CallbackMetrics:
+    """
+    Instrumentation of the Dash callback endpoint.
+
+    Args:
+        registry: MetricsRegistry receiving the values; a new one by default
+        directory: Folder shared by the worker processes, or None to report
+            only the values of the scraped process
+        flush_interval: Seconds between two writes of this process' values to
+            ``directory``
+    """
+
+    def __init__(self, registry=None, directory=None, flush_interval=1.0):
+        self.registry = registry if registry is not None else MetricsRegistry()
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self.collectors = []
+        self._flusher_pid = None
+        self._dirty = threading.Event()
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.registry.define(
+            "callback_duration_seconds",
+            "histogram",
+            "Duration of the Dash callback requests by phase",
+            LATENCY_BUCKETS,
+        )
+        self.registry.define(
+            "callback_requests_total",
+            "counter",
+            "Dash callback requests by response status",
+        )
+        self.registry.define(
+            "callback_response_bytes",
+            "histogram",
+            "Size of the Dash callback responses",
+            SIZE_BUCKETS,
+        )
+
+    def callback(self, name):
+        """
+        Decorate a Dash callback so its requests are labelled and timed.
+
+        Args:
+            name: Label of the callback in the metrics
+
+        Returns:
+            function: Decorator
+        """
+
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not flask.has_request_context():
+                    return func(*args, **kwargs)
+                flask.g.metrics_callback = name
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    flask.g.metrics_callback_seconds = time.perf_counter() - start
+
+            return wrapper
+
+        return decorator
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        """
+        Time a phase of the current callback (outside a request: no-op).
+
+        Args:
+            name: Phase name, e.g. "ranking"
+        """
+        if not flask.has_request_context():
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            phases = flask.g.setdefault("metrics_phases", {})
+            phases[name] = phases.get(name, 0.0) + time.perf_counter() - start
+
+    def record(self, response):
+        """
+        Record the metrics of a finished callback request.
+
+        Args:
+            response: Flask response of the request
+        """
+        g = flask.g
+        total = time.perf_counter() - g.metrics_start
+        name = g.get("metrics_callback", "unknown")
+        callback_seconds = g.get("metrics_callback_seconds", 0.0)
+        phases = dict(g.get("metrics_phases", {}))
+        phases["components"] = max(callback_seconds - sum(phases.values()), 0.0)
+        phases["serialization"] = max(total - callback_seconds, 0.0)
+        phases["total"] = total
+
+        registry = self.registry
+        for phase, seconds in phases.items():
+            registry.observe(
+                "callback_duration_seconds", seconds, callback=name, phase=phase
+            )
+        registry.inc(
+            "callback_requests_total", callback=name, status=str(response.status_code)
+        )
+        size = response.calculate_content_length()
+        if size is not None:
+            registry.observe("callback_response_bytes", size, callback=name)
+
+    def install(self, app, route="/metrics"):
+        """
+        Register the request hooks and the metrics route on the app's server.
+
+        Args:
+            app: Dash application
+            route: Path of the metrics route
+        """
+        callback_path = app.config.routes_pathname_prefix + CALLBACK_PATH
+        server = app.server
+
+        @server.before_request
+        def start_timer():
+            if flask.request.path == callback_path:
+                flask.g.metrics_start = time.perf_counter()
+
+        @server.after_request
+        def record_callback(response):
+            if "metrics_start" in flask.g:
+                self.record(response)
+                self._schedule_flush()
+            return response
+
+        @server.route(route)
+        def metrics():
+            return flask.Response(
+                self.render(), mimetype="text/plain; version=0.0.4; charset=utf-8"
+            )
+
+    def collect(self):
+        """Run the collectors, which set gauges and counters from other state."""
+        for collector in self.collectors:
+            collector(self.registry)
+
+    def _schedule_flush(self):
+        if not self.directory:
+            return
+        self._dirty.set()
+        # The thread does not survive a fork; start one per worker process
+        if self._flusher_pid != os.getpid():
+            self._flusher_pid = os.getpid()
+            threading.Thread(
+                target=self._flush_periodically, name="metrics-flusher", daemon=True
+            ).start()
+
+    def _flush_periodically(self):
+        while True:
+            self._dirty.wait()
+            time.sleep(self.flush_interval)
+            self._dirty.clear()
+            self.flush()
+
+    def flush(self):
+        """
+        Write this process' values to the shared directory.
+        """
+        if not self.directory:
+            return
+        self.collect()
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(self.registry.snapshot(), f)
+        os.replace(tmp_path, os.path.join(self.directory, f"{os.getpid()}.json"))
+
+    def render(self):
+        """
+        Return the metrics of this process, or of all processes sharing the
+        directory, in the Prometheus text format.
+
+        Returns:
+            str: Exposition text
+        """
+        if not self.directory:
+            self.collect()
+            return self.registry.render([self.registry.snapshot()])
+        self.flush()
+        snapshots = []
+        for path in glob.glob(os.path.join(self.directory, "*.json")):
+            try:
+                with open(path) as f:
+                    snapshots.append(json.load(f))
+            except (OSError, ValueError):
+                continue
+        return self.registry.render(snapshots)
+
+
+def clear_snapshots(directory):
+    """
+    Remove the values written to a shared directory by previous processes.
+
+    Args:
+        directory: Folder shared by the worker processes
+    """
+    for path in glob.glob(os.path.join(directory, "*.json")):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
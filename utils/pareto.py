@@ -0,0 +1,179 @@
+"""
+Pareto fronts of a catalogue and ranking layered by front.
+
+A phone dominates another when it is at least as good on every criterion and
+better on one. The first front is the set of non-dominated phones, the second
+front is the non-dominated set of the rest, and so on. The fronts are computed
+once per catalogue load by peeling non-dominated sets:
+
+- the points are sorted lexicographically, which puts every point after all the
+  points that dominate it, so each point only has to be compared with the
+  front found so far
+- the points are checked in blocks against the front with broadcasted
+  comparisons, so there is no Python loop over pairs of points; only the
+  points of a block that the front does not dominate are compared with each
+  other, and the front is scanned from its strongest members on, so that most
+  points are discarded after a few comparisons
+
+Peeling can stop once enough points are assigned, since the recommendations
+only need the fronts that hold the shown phones.
+"""
+
+import numpy as np
+
+# Points compared with the front at a time
+BLOCK_SIZE = 4096
+
+# Front members compared with a block at a time; rows dominated by a slice are
+# not compared with the next ones
+FRONT_SLICE = 8
+
+
+def _dominated_by(block, front, slice_size=None):
+    """
+    Flag the rows of ``block`` dominated by at least one row of ``front``.
+
+    Both arrays follow the minimization convention. ``slice_size`` defaults
+    to FRONT_SLICE.
+    """
+    slice_size = slice_size or FRONT_SLICE
+    dominated = np.zeros(len(block), dtype=bool)
+    rows = np.arange(len(block))
+    for start in range(0, len(front), slice_size):
+        part = front[None, start : start + slice_size, :]
+        points = block[rows, None, :]
+        hit = ((part <= points).all(axis=2) & (part < points).any(axis=2)).any(axis=1)
+        dominated[rows[hit]] = True
+        rows = rows[~hit]
+        if not rows.size:
+            break
+    return dominated
+
+
+def _non_dominated(points, block_size=None):
+    """
+    Flag the non-dominated rows of lexicographically sorted points.
+
+    Args:
+        points: Array of shape (n, n_objectives), minimized, sorted so that
+            dominating points come first
+        block_size: Points compared with the front at a time (default
+            BLOCK_SIZE)
+
+    Returns:
+        np.ndarray: Boolean mask of the non-dominated rows
+    """
+    block_size = block_size or BLOCK_SIZE
+    keep = np.zeros(len(points), dtype=bool)
+    front = points[:0]
+    for start in range(0, len(points), block_size):
+        block = points[start : start + block_size]
+        # Most points are dominated by the front found so far; only the rest
+        # are compared with each other. A point dominated by a discarded point
+        # is dominated by the front member that discarded it as well.
+        survivors = np.flatnonzero(~_dominated_by(block, front))
+        if survivors.size:
+            candidates = block[survivors]
+            survivors = survivors[~_dominated_by(candidates, candidates)]
+            keep[start + survivors] = True
+            front = np.concatenate([front, block[survivors]])
+            # Members with the smallest sum dominate the most points; checking
+            # them first lets most rows stop after the first slice
+            front = front[np.argsort(front.sum(axis=1), kind="stable")]
+    return keep
+
+
+def non_dominated_sort(points, min_count=None):
+    """
+    Assign each point the index of its Pareto front.
+
+    Args:
+        points: Array-like of shape (n, n_objectives); every objective is
+            minimized
+        min_count: Stop once the fronts found hold at least this many points
+            (None to sort all the points)
+
+    Returns:
+        np.ndarray: Front per point, 0 for the non-dominated points. When
+        peeling stops early, the points left are all given the next index.
+    """
+    points = np.asarray(points, dtype=np.float64)
+    fronts = np.empty(len(points), dtype=np.int32)
+    # Lexicographic order: a point that dominates another comes before it
+    remaining = np.lexsort(points.T[::-1])
+    front = 0
+    assigned = 0
+    while remaining.size and (min_count is None or assigned < min_count):
+        keep = _non_dominated(points[remaining])
+        fronts[remaining[keep]] = front
+        assigned += int(keep.sum())
+        remaining = remaining[~keep]
+        front += 1
+    fronts[remaining] = front
+    return fronts
+
+
+class FrontRanking:
+    """
+    Ranking that prefers phones of earlier Pareto fronts.
+
+    The phones are ordered by front, then by their Chebyshev distance to the
+    aspiration vector, so the results come from the non-dominated phones first
+    and later fronts only fill the remaining places. Only the fronts needed for
+    ``k`` results are computed and searched.
+
+    Args:
+        engine: RankingEngine of the catalogue
+        k: Largest number of phones a query returns
+    """
+
+    def __init__(self, engine, k):
+        self.engine = engine
+        self.k = k
+        # engine.matrix is maximized (1 is best); the sort minimizes
+        self.fronts = non_dominated_sort(-engine.matrix, min_count=k)
+        # Fronts holding the first k phones; the phones left after peeling
+        # stopped share a placeholder front and are never searched
+        held = np.cumsum(np.bincount(self.fronts))
+        last = np.searchsorted(held, min(k, len(engine)))
+        self.positions = np.flatnonzero(self.fronts <= last)
+        self.matrix = engine.matrix[self.positions]
+        self.layers = self.fronts[self.positions]
+
+    def __len__(self):
+        return len(self.engine)
+
+    def top_k(self, aspirations, k):
+        """
+        Return the k best phones, earlier fronts first.
+
+        Args:
+            aspirations: Array-like with one raw value per criterion
+            k: Number of phones to return (capped at ``self.k`` and at the
+                catalogue size)
+
+        Returns:
+            np.ndarray: Row positions of the phones, best first
+        """
+        distance = np.abs(self.matrix - self.engine.normalize(aspirations)).max(axis=1)
+        order = np.lexsort((self.positions, distance, self.layers))
+        return self.positions[order[: min(k, self.k)]]
+
+    def top_k_batch(self, aspirations, k, max_bytes=None):
+        """
+        Return ``top_k`` for each of many aspiration vectors.
+
+        Args:
+            aspirations: Array-like of shape (m, n_criteria) with raw values
+            k: Number of phones per row
+            max_bytes: Unused; the searched fronts are small
+
+        Returns:
+            np.ndarray: Row positions of shape (m, k), best first
+        """
+        aspirations = np.atleast_2d(aspirations)
+        k = min(k, self.k, len(self.positions))
+        result = np.empty((len(aspirations), k), dtype=np.intp)
+        for row, values in enumerate(aspirations):
+            result[row] = self.top_k(values, k)
+        return result
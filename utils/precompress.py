@@ -0,0 +1,236 @@
+"""
+Precompressed static files served with Accept-Encoding negotiation.
+
+A build step writes gzip and brotli copies of the files in the assets folder
+and of the Dash component bundles (the ``/_dash-component-suites/`` JavaScript
+and CSS) to a separate folder. At runtime a ``before_request`` hook serves the
+best precompressed variant the client accepts, with an ETag, so nothing is
+compressed per request. Requests for which no fresh variant exists fall through
+to the regular Dash/Flask handlers.
+
+Build with::
+
+    python -m utils.precompress [assets_folder] [output_folder]
+
+Brotli variants are only written when the ``brotli`` package is installed.
+"""
+
+import gzip
+import mimetypes
+import os
+import sys
+
+import flask
+from dash.fingerprint import check_fingerprint
+from werkzeug.security import safe_join
+
+from utils.asset_fingerprints import AssetFingerprints
+
+# Packages whose bundles Dash serves under /_dash-component-suites/
+DASH_PACKAGES = ("dash", "dash_bootstrap_components", "plotly")
+
+# Extensions considered for compression; variants that do not save at least
+# MIN_SAVING of the original size (e.g. JPEG, PNG) are not kept
+COMPRESSIBLE_EXTENSIONS = (".js", ".css", ".svg", ".json", ".ico", ".png", ".jpg")
+MIN_SAVING = 0.1
+MIN_SIZE = 1024
+
+# Content-Encoding -> file suffix, in order of preference
+ENCODINGS = {"br": ".br", "gzip": ".gz"}
+
+SUITES_FOLDER = "_dash-component-suites"
+ASSETS_FOLDER = "assets"
+
+
+def _compress(data, encoding):
+    if encoding == "gzip":
+        return gzip.compress(data, compresslevel=9, mtime=0)
+    import brotli
+
+    return brotli.compress(data, quality=11)
+
+
+def _available_encodings():
+    encodings = ["gzip"]
+    try:
+        import brotli  # noqa: F401
+    except ImportError:
+        return encodings
+    return ["br"] + encodings
+
+
+def precompress_tree(source_folder, target_folder, skip_folders=()):
+    """
+    Write compressed variants of the compressible files of a folder.
+
+    Variants are only rewritten when missing or older than their source.
+
+    Args:
+        source_folder: Folder with the original files
+        target_folder: Folder mirroring ``source_folder`` for the variants
+        skip_folders: Names of subfolders to ignore
+
+    Returns:
+        int: Number of variant files written
+    """
+    encodings = _available_encodings()
+    written = 0
+    for root, folders, files in os.walk(source_folder):
+        folders[:] = [f for f in folders if f not in skip_folders]
+        for name in files:
+            source = os.path.join(root, name)
+            if not name.endswith(COMPRESSIBLE_EXTENSIONS):
+                continue
+            if os.path.getsize(source) < MIN_SIZE:
+                continue
+            relative = os.path.relpath(source, source_folder)
+            source_mtime = os.path.getmtime(source)
+            data = None
+            for encoding in encodings:
+                target = os.path.join(target_folder, relative + ENCODINGS[encoding])
+                if os.path.exists(target) and os.path.getmtime(target) >= source_mtime:
+                    continue
+                if data is None:
+                    with open(source, "rb") as f:
+                        data = f.read()
+                compressed = _compress(data, encoding)
+                if len(compressed) > len(data) * (1 - MIN_SAVING):
+                    continue
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                with open(target, "wb") as f:
+                    f.write(compressed)
+                written += 1
+    return written
+
+
+def build(assets_folder, output_folder, packages=DASH_PACKAGES):
+    """
+    Precompress the assets folder and the Dash component bundles.
+
+    Args:
+        assets_folder: Path of the Dash assets folder
+        output_folder: Folder receiving the compressed variants
+        packages: Python packages whose bundles Dash serves
+
+    Returns:
+        int: Number of variant files written
+    """
+    written = precompress_tree(
+        assets_folder, os.path.join(output_folder, ASSETS_FOLDER)
+    )
+    for package in packages:
+        module = __import__(package)
+        written += precompress_tree(
+            os.path.dirname(module.__file__),
+            os.path.join(output_folder, SUITES_FOLDER, package),
+            skip_folders=("__pycache__", "tests", "testing", "node_modules"),
+        )
+    return written
+
+
+class PrecompressedFiles:
+    """
+    Serve precompressed variants of static files.
+
+    Args:
+        output_folder: Folder written by ``build``
+        assets_folder: Path of the Dash assets folder
+        packages: Python packages whose bundles may be served
+    """
+
+    def __init__(self, output_folder, assets_folder, packages=DASH_PACKAGES):
+        self.output_folder = output_folder
+        self.assets_folder = assets_folder
+        self.packages = packages
+        # Content hashes of the variants, used as ETags
+        self._fingerprints = AssetFingerprints(output_folder)
+
+    def resolve(self, app, path):
+        """
+        Map a request path to its original file.
+
+        Args:
+            app: Dash application
+            path: Request path
+
+        Returns:
+            tuple or None: (original file, variant path relative to the output
+            folder without encoding suffix, whether the URL has a Dash
+            fingerprint), or None if the path is not a static file handled here
+        """
+        assets_prefix = app.get_asset_url("")
+        suites_prefix = app.config.requests_pathname_prefix + SUITES_FOLDER + "/"
+        if path.startswith(assets_prefix):
+            relative = path[len(assets_prefix) :]
+            source = safe_join(self.assets_folder, relative)
+            return source, f"{ASSETS_FOLDER}/{relative}", False
+        if path.startswith(suites_prefix):
+            package, _, fingerprinted_path = path[len(suites_prefix) :].partition("/")
+            if package not in self.packages or package not in sys.modules:
+                return None
+            relative, has_fingerprint = check_fingerprint(fingerprinted_path)
+            # Only serve what Dash itself would serve
+            if relative not in app.registered_paths.get(package, ()):
+                return None
+            source = safe_join(os.path.dirname(sys.modules[package].__file__), relative)
+            return source, f"{SUITES_FOLDER}/{package}/{relative}", has_fingerprint
+        return None
+
+    def install(self, app):
+        """
+        Register the request hooks on the app's Flask server.
+
+        Args:
+            app: Dash application serving the files
+        """
+
+        @app.server.before_request
+        def serve_precompressed():
+            request = flask.request
+            if request.method not in ("GET", "HEAD"):
+                return None
+            resolved = self.resolve(app, request.path)
+            if resolved is None or resolved[0] is None:
+                return None
+            source, variant, has_fingerprint = resolved
+            try:
+                source_mtime = os.path.getmtime(source)
+            except OSError:
+                return None
+
+            for encoding, suffix in ENCODINGS.items():
+                if not request.accept_encodings[encoding]:
+                    continue
+                compressed = safe_join(self.output_folder, variant + suffix)
+                try:
+                    if os.path.getmtime(compressed) < source_mtime:
+                        continue  # Outdated variant
+                except (OSError, TypeError):
+                    continue
+                mimetype = mimetypes.guess_type(source)[0] or "application/octet-stream"
+                response = flask.send_file(
+                    compressed,
+                    mimetype=mimetype,
+                    etag=self._fingerprints.fingerprint(variant + suffix),
+                    conditional=True,
+                    # Fingerprinted bundles are good forever, as in Dash
+                    max_age=31536000 if has_fingerprint else None,
+                )
+                response.headers["Content-Encoding"] = encoding
+                response.vary.add("Accept-Encoding")
+                return response
+            return None
+
+        @app.server.after_request
+        def vary_on_accept_encoding(response):
+            if self.resolve(app, flask.request.path) is not None:
+                response.vary.add("Accept-Encoding")
+            return response
+
+
+if __name__ == "__main__":
+    assets = sys.argv[1] if len(sys.argv) > 1 else "assets"
+    output = (
+        sys.argv[2] if len(sys.argv) > 2 else os.path.join("build", "precompressed")
+    )
+    print(f"Wrote {build(assets, output)} compressed files to {output}")
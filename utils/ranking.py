@@ -0,0 +1,202 @@
+"""
+Ranking engine for the phone recommendation callback.
+
+The catalogue criteria are stored once as a contiguous float64 matrix that is
+already min-max normalized to [0, 1] and direction-flipped, so that 1 is always
+the best value of a criterion. Answering a request then only requires
+normalizing the (small) aspiration vector and running a single vectorized
+Chebyshev reduction over the matrix.
+"""
+
+import numpy as np
+
+# Upper bound on the temporary (chunk, n_phones, n_criteria) array built by
+# RankingEngine.top_k_batch
+BATCH_MAX_BYTES = 64 * 2**20
+
+
+class RankingEngine:
+    """
+    Aspiration-based ranking over a fixed set of criteria.
+
+    Args:
+        values: Array-like of shape (n_phones, n_criteria) with the raw criteria
+        directions: Optimization direction per criterion, using the same
+            convention as ``fitness_columns`` in ``main.py``:
+            -1 to maximize (higher is better), 1 to minimize (lower is better)
+    """
+
+    def __init__(self, values, directions):
+        values = np.array(values, dtype=np.float64, order="C")
+        directions = np.asarray(directions)
+
+        self.data_min = values.min(axis=0)
+        data_range = values.max(axis=0) - self.data_min
+        # A constant criterion carries no information; avoid dividing by zero
+        data_range[data_range == 0] = 1.0
+        self.data_range = data_range
+        self.minimize = directions == 1
+
+        matrix = (values - self.data_min) / self.data_range
+        matrix[:, self.minimize] = 1.0 - matrix[:, self.minimize]
+        matrix.setflags(write=False)
+        self.matrix = matrix
+
+    @classmethod
+    def from_frame(cls, frame, fitness_columns):
+        """
+        Build an engine from a DataFrame and a ``{column: direction}`` mapping.
+
+        Args:
+            frame: DataFrame containing the catalogue
+            fitness_columns: Ordered mapping of criterion column to direction
+
+        Returns:
+            RankingEngine: Engine whose criteria follow the mapping's order
+        """
+        columns = list(fitness_columns)
+        return cls(
+            frame[columns].to_numpy(dtype=np.float64),
+            [fitness_columns[col] for col in columns],
+        )
+
+    def __len__(self):
+        return self.matrix.shape[0]
+
+    def normalize(self, aspirations):
+        """
+        Map raw aspiration values onto the normalized criteria scale.
+
+        Args:
+            aspirations: Array-like with one value per criterion
+
+        Returns:
+            np.ndarray: Normalized, direction-flipped aspiration vector
+        """
+        aspirations = np.asarray(aspirations, dtype=np.float64)
+        normalized = (aspirations - self.data_min) / self.data_range
+        normalized[..., self.minimize] = 1.0 - normalized[..., self.minimize]
+        return normalized
+
+    def distances(self, aspirations):
+        """
+        Chebyshev distance from the aspiration vector to every phone.
+
+        Args:
+            aspirations: Array-like with one raw value per criterion
+
+        Returns:
+            np.ndarray: Distance per phone, shape (n_phones,)
+        """
+        return np.abs(self.matrix - self.normalize(aspirations)).max(axis=1)
+
+    def order(self, aspirations):
+        """
+        Rank all phones by their distance to the aspiration vector.
+
+        Args:
+            aspirations: Array-like with one raw value per criterion
+
+        Returns:
+            np.ndarray: Row positions, closest match first
+        """
+        return np.argsort(self.distances(aspirations), kind="stable")
+
+    def top_k(self, aspirations, k):
+        """
+        Return the k phones closest to the aspiration vector.
+
+        Uses ``np.argpartition`` to select the k winners in linear time and only
+        sorts those, instead of sorting the whole catalogue.
+
+        Args:
+            aspirations: Array-like with one raw value per criterion
+            k: Number of phones to return (capped at the catalogue size)
+
+        Returns:
+            np.ndarray: Row positions of the k closest phones, closest first
+        """
+        return top_k_from_distances(self.distances(aspirations), k)
+
+    def top_k_batch(self, aspirations, k, max_bytes=BATCH_MAX_BYTES):
+        """
+        Return the k closest phones for each of many aspiration vectors.
+
+        Distances are computed with one broadcasted operation per chunk of
+        aspiration vectors; the chunk size is chosen so that the temporary
+        (chunk, n_phones, n_criteria) array stays below ``max_bytes``.
+
+        Args:
+            aspirations: Array-like of shape (m, n_criteria) with raw values
+            k: Number of phones per row (capped at the catalogue size)
+            max_bytes: Peak size of the temporary distance array
+
+        Returns:
+            np.ndarray: Row positions of shape (m, k), closest first; each row
+            equals ``top_k`` for the corresponding aspiration vector
+        """
+        normalized = np.atleast_2d(self.normalize(aspirations))
+        m = normalized.shape[0]
+        n, n_criteria = self.matrix.shape
+        k = min(k, n)
+        result = np.empty((m, k), dtype=np.intp)
+        if m == 0 or k == 0:
+            return result
+
+        chunk = max(1, int(max_bytes // (n * n_criteria * 8)))
+        for start in range(0, m, chunk):
+            block = normalized[start : start + chunk]
+            distance = np.abs(self.matrix[None, :, :] - block[:, None, :]).max(axis=2)
+            result[start : start + chunk] = _top_k_rows(distance, k)
+        return result
+
+
+def _top_k_rows(distance, k):
+    """
+    Row-wise version of ``top_k_from_distances`` for a 2-D distance array.
+    """
+    rows, n = distance.shape
+    if k < n:
+        winners = np.argpartition(distance, k - 1, axis=1)[:, :k]
+    else:
+        winners = np.broadcast_to(np.arange(n), (rows, n))
+    winner_distance = np.take_along_axis(distance, winners, axis=1)
+    order = np.lexsort((winners, winner_distance), axis=1)
+    result = np.take_along_axis(winners, order, axis=1)
+
+    if k < n:
+        # Rows with ties at the k-th distance may have picked a different
+        # phone than a stable sort would; redo those rows exactly
+        kth = winner_distance.max(axis=1)
+        tied = np.flatnonzero((distance <= kth[:, None]).sum(axis=1) > k)
+        for row in tied:
+            result[row] = top_k_from_distances(distance[row], k)
+    return result
+
+
+def top_k_from_distances(distance, k):
+    """
+    Select the k smallest entries of a distance vector, in ascending order.
+
+    Ties are broken by row position, so the result matches the first k entries
+    of a stable full sort.
+
+    Args:
+        distance: 1-D array of distances
+        k: Number of entries to return (capped at ``len(distance)``)
+
+    Returns:
+        np.ndarray: Row positions of the k smallest distances
+    """
+    n = distance.shape[0]
+    k = min(k, n)
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    if k < n:
+        # Distance of the k-th best phone; everything at or below it is a
+        # candidate (more than k only when there are ties at the boundary)
+        kth = distance[np.argpartition(distance, k - 1)[k - 1]]
+        candidates = np.flatnonzero(distance <= kth)
+    else:
+        candidates = np.arange(n)
+    return candidates[np.argsort(distance[candidates], kind="stable")[:k]]
@@ -0,0 +1,448 @@
+"""
+Memoization of recommendation results keyed on the slider values.
+
+Visitors tend to converge on a handful of slider settings, so the output of the
+recommendation callback (ranking plus the Dash components built from it) is
+cached under the rounded aspiration tuple. The cache counts hits and misses, and
+keys include a namespace (the catalogue fingerprint, code version and settings),
+so results of a previous catalogue are never served after its ranking
+structures are rebuilt.
+
+Entries live in a pluggable backend: an in-process LRU (the default), or a
+filesystem or SQLite store that is shared by all worker processes on a host.
+All backends are bounded in size and support an optional time-to-live.
+"""
+
+import functools
+import hashlib
+import os
+import pickle
+import sqlite3
+import stat
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+
+class LRUBackend:
+    """
+    In-process store with least-recently-used eviction.
+
+    Args:
+        maxsize: Maximum number of entries kept
+        ttl: Seconds an entry stays valid (0 for no expiry)
+    """
+
+    # Entries are only seen by this process
+    shared = False
+
+    def __init__(self, maxsize=1024, ttl=0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        # Values that could not be stored
+        self.skipped = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        with self._lock:
+            try:
+                expires, value = self._entries[key]
+            except KeyError:
+                return False, None
+            if expires and expires < time.time():
+                del self._entries[key]
+                return False, None
+            self._entries.move_to_end(key)
+            return True, value
+
+    def set(self, key, value):
+        expires = time.time() + self.ttl if self.ttl else 0
+        with self._lock:
+            self._entries[key] = (expires, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class FileSystemBackend:
+    """
+    Store with one pickle file per entry, shared by processes on one host.
+
+    Files are written atomically and hold the expiry time next to the value.
+    Their modification time is refreshed on every hit, so pruning the oldest
+    files approximates LRU eviction.
+
+    Args:
+        directory: Directory holding the entries (created if missing)
+        maxsize: Maximum number of entries kept
+        ttl: Seconds an entry stays valid (0 for no expiry)
+    """
+
+    suffix = ".result"
+    shared = True
+
+    def __init__(self, directory, maxsize=1024, ttl=0):
+        self.directory = directory
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.skipped = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        digest = hashlib.sha1(repr(key).encode()).hexdigest()
+        return os.path.join(self.directory, digest + self.suffix)
+
+    def _files(self):
+        with os.scandir(self.directory) as entries:
+            return [e for e in entries if e.name.endswith(self.suffix)]
+
+    def __len__(self):
+        return len(self._files())
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                expires, value = pickle.load(f)
+            if expires and expires < time.time():
+                os.remove(path)
+                return False, None
+            os.utime(path)
+        except (OSError, EOFError, TypeError, ValueError, pickle.UnpicklingError):
+            return False, None
+        return True, value
+
+    def set(self, key, value):
+        expires = time.time() + self.ttl if self.ttl else 0
+        tmp_path = None
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump((expires, value), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self._path(key))
+        except OSError:
+            # Disk full, read-only or removed directory: skip storing
+            self.skipped += 1
+            if tmp_path is not None:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+            return
+        self._prune()
+
+    def _prune(self):
+        files = self._files()
+        if len(files) <= self.maxsize:
+            return
+        files.sort(key=lambda e: e.stat().st_mtime)
+        for entry in files[: len(files) - self.maxsize]:
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
+
+    def clear(self):
+        for entry in self._files():
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
+
+
+class SQLiteBackend:
+    """
+    Store in a SQLite database, shared by processes on one host.
+
+    Each thread uses its own connection; the database runs in WAL mode so that
+    readers in other workers are not blocked by writes.
+
+    Args:
+        path: Database file (created if missing)
+        maxsize: Maximum number of entries kept
+        ttl: Seconds an entry stays valid (0 for no expiry)
+    """
+
+    shared = True
+
+    def __init__(self, path, maxsize=1024, ttl=0):
+        self.path = path
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.skipped = 0
+        self._local = threading.local()
+        with self._connection() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "key TEXT PRIMARY KEY, value BLOB, expires REAL, accessed REAL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed)"
+            )
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        # A connection must not be reused in a forked worker
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def __len__(self):
+        return self._connection().execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def get(self, key):
+        now = time.time()
+        try:
+            with self._connection() as conn:
+                row = conn.execute(
+                    "SELECT value FROM results WHERE key = ? AND expires > ?",
+                    (repr(key), now),
+                ).fetchone()
+                if row is None:
+                    return False, None
+                conn.execute(
+                    "UPDATE results SET accessed = ? WHERE key = ?", (now, repr(key))
+                )
+        except sqlite3.OperationalError:
+            # Database busy or locked: treat as a miss rather than failing
+            return False, None
+        return True, pickle.loads(row[0])
+
+    def set(self, key, value):
+        now = time.time()
+        expires = now + self.ttl if self.ttl else float("inf")
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        try:
+            with self._connection() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)",
+                    (repr(key), blob, expires, now),
+                )
+                conn.execute(
+                    "DELETE FROM results WHERE expires <= ? OR key IN ("
+                    "SELECT key FROM results ORDER BY accessed DESC "
+                    "LIMIT -1 OFFSET ?)",
+                    (now, self.maxsize),
+                )
+        except sqlite3.OperationalError:
+            self.skipped += 1
+
+    def clear(self):
+        with self._connection() as conn:
+            conn.execute("DELETE FROM results")
+
+
+def private_directory():
+    """
+    Return a directory in the system temporary directory only this user can use.
+
+    The shared backends unpickle what they read, so their default location must
+    not be writable by other users. The directory is created with mode 0700;
+    an existing one is only used if it belongs to this user and is private.
+
+    Returns:
+        str: Path of the directory
+
+    Raises:
+        PermissionError: If the directory exists but is not private
+    """
+    path = os.path.join(tempfile.gettempdir(), f"phone-results-{os.getuid()}")
+    try:
+        os.mkdir(path, 0o700)
+    except FileExistsError:
+        pass
+    info = os.lstat(path)
+    if (
+        not stat.S_ISDIR(info.st_mode)
+        or info.st_uid != os.getuid()
+        or info.st_mode & 0o077
+    ):
+        raise PermissionError(
+            f"{path} is not a private directory; set RESULTS_CACHE_PATH"
+        )
+    return path
+
+
+def create_backend(kind="memory", path=None, maxsize=1024, ttl=0):
+    """
+    Create a result cache backend by name.
+
+    Args:
+        kind: "memory", "filesystem" or "sqlite"
+        path: Directory (filesystem) or database file (sqlite); defaults to a
+            location in the private_directory()
+        maxsize: Maximum number of entries kept
+        ttl: Seconds an entry stays valid (0 for no expiry)
+
+    Returns:
+        Backend instance
+    """
+    if kind == "memory":
+        return LRUBackend(maxsize, ttl)
+    if kind == "filesystem":
+        path = path or os.path.join(private_directory(), "entries")
+        return FileSystemBackend(path, maxsize, ttl)
+    if kind == "sqlite":
+        path = path or os.path.join(private_directory(), "results.sqlite")
+        return SQLiteBackend(path, maxsize, ttl)
+    raise ValueError(f"Unknown result cache backend: {kind!r}")
+
+
+class ResultCache:
+    """
+    Memoization front-end with hit/miss counters over a storage backend.
+
+    Args:
+        maxsize: Maximum number of entries of the default in-process backend
+            (0 disables caching)
+        ndigits: Number of decimals the slider values are rounded to in the key
+        backend: Storage backend; defaults to an ``LRUBackend(maxsize)``
+    """
+
+    def __init__(self, maxsize=1024, ndigits=0, backend=None):
+        self.maxsize = maxsize
+        self.ndigits = ndigits
+        self.backend = backend if backend is not None else LRUBackend(maxsize)
+        # Identifies the catalogue version; part of every key so that a shared
+        # store never serves results computed from another catalogue
+        self.namespace = ""
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.backend)
+
+    def key(self, choices):
+        """
+        Build the rounded slider tuple for a set of slider values.
+
+        Args:
+            choices: Slider values
+
+        Returns:
+            tuple: Values rounded to ``ndigits`` decimals
+        """
+        if self.ndigits == 0:
+            return tuple(int(round(float(value))) for value in choices)
+        return tuple(round(float(value), self.ndigits) for value in choices)
+
+    def get(self, key, namespace=None):
+        """
+        Look up an entry and update the hit/miss counters.
+
+        Args:
+            key: Rounded slider tuple
+            namespace: Namespace of the entry; defaults to the current one
+
+        Returns:
+            tuple: (found, value)
+        """
+        if namespace is None:
+            namespace = self.namespace
+        found, value = self.backend.get((namespace, key))
+        with self._lock:
+            if found:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return found, value
+
+    def set(self, key, value, namespace=None):
+        """
+        Store an entry; the backend evicts old entries above its size bound.
+
+        Args:
+            key: Rounded slider tuple
+            value: Value to store
+            namespace: Namespace of the entry; defaults to the current one
+        """
+        if self.maxsize <= 0:
+            return
+        if namespace is None:
+            namespace = self.namespace
+        self.backend.set((namespace, key), value)
+
+    def switch_namespace(self, namespace):
+        """
+        Make another catalogue version current, e.g. after a reload.
+
+        Entries of other versions are no longer looked up. The in-process store
+        drops them; shared stores keep them, as other workers may still be on
+        that version, and evict them by size and time-to-live.
+
+        Args:
+            namespace: New catalogue version identifier
+        """
+        self.namespace = namespace
+        if not self.backend.shared:
+            self.backend.clear()
+
+    def clear(self):
+        """
+        Drop all entries of every catalogue version.
+        """
+        self.backend.clear()
+
+    def stats(self):
+        """
+        Return the cache counters.
+
+        Returns:
+            dict: Hits, misses, hit ratio, skipped stores, current size and
+            maximum size
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "skipped": self.backend.skipped,
+            "size": len(self),
+            "maxsize": self.backend.maxsize,
+        }
+
+    def memoize(self, func):
+        """
+        Decorate a function of the slider values with this cache.
+
+        The wrapped function is called with the rounded values, so a cached
+        result is always the one computed for its key. A result is stored under
+        the ``namespace`` keyword argument of the call, or else the namespace
+        that was current when the call started, so a result computed while the
+        catalogue is swapped is never served for the new catalogue. Other
+        keyword arguments are passed on to the function but are not part of
+        the key: they must be determined by the namespace.
+
+        Args:
+            func: Function taking the slider values as positional arguments
+
+        Returns:
+            function: Memoized function
+        """
+
+        @functools.wraps(func)
+        def wrapper(*choices, namespace=None, **kwargs):
+            key = self.key(choices)
+            if namespace is None:
+                namespace = self.namespace
+            found, value = self.get(key, namespace)
+            if not found:
+                value = func(*key, **kwargs)
+                self.set(key, value, namespace)
+            return value
+
+        return wrapper
@@ -0,0 +1,97 @@
+"""
+Precomputed recommendations for every reachable slider combination.
+
+The preference sliders only allow a finite set of values (their marks, or a
+regular step between min and max), so the whole aspiration space can be
+enumerated once at startup. The top-k row positions for every combination are
+stored in a compact integer array, turning each request into a table lookup.
+"""
+
+import numpy as np
+
+
+def slider_values(settings):
+    """
+    List the values a ``dcc.Slider`` can take.
+
+    Args:
+        settings: Dict with the slider's ``min``, ``max``, ``step`` and ``marks``
+
+    Returns:
+        list: Sorted reachable values
+    """
+    if settings.get("step") is None:
+        return sorted(settings["marks"])
+    values = np.arange(
+        settings["min"], settings["max"] + settings["step"], settings["step"]
+    )
+    values = values[values <= settings["max"]]
+    return sorted(set(values.tolist()) | set(settings.get("marks", {})))
+
+
+class SliderGrid:
+    """
+    Lookup table with the top-k phones for every slider combination.
+
+    Args:
+        engine: RankingEngine used to compute the table
+        axes: One list of reachable values per criterion, in engine order
+        k: Number of phones stored per combination
+    """
+
+    def __init__(self, engine, axes, k):
+        self.axes = [np.asarray(sorted(axis), dtype=np.float64) for axis in axes]
+        self._positions = [
+            {value: i for i, value in enumerate(axis.tolist())} for axis in self.axes
+        ]
+        shape = tuple(len(axis) for axis in self.axes)
+
+        mesh = np.meshgrid(*self.axes, indexing="ij")
+        combinations = np.stack([grid.ravel() for grid in mesh], axis=1)
+        top = engine.top_k_batch(combinations, k)
+
+        dtype = np.uint16 if len(engine) <= np.iinfo(np.uint16).max else np.uint32
+        self.table = top.astype(dtype).reshape(*shape, top.shape[1])
+
+    @classmethod
+    def from_sliders(cls, engine, slider_settings, k):
+        """
+        Build the grid from the layout's slider settings.
+
+        Args:
+            engine: RankingEngine used to compute the table
+            slider_settings: Ordered mapping of slider id to its settings
+            k: Number of phones stored per combination
+
+        Returns:
+            SliderGrid: Grid covering every reachable slider combination
+        """
+        return cls(engine, [slider_values(s) for s in slider_settings.values()], k)
+
+    @property
+    def combinations(self):
+        return int(np.prod(self.table.shape[:-1]))
+
+    @property
+    def nbytes(self):
+        return self.table.nbytes
+
+    def lookup(self, choices):
+        """
+        Return the precomputed top-k row positions for a slider combination.
+
+        Args:
+            choices: One slider value per criterion
+
+        Returns:
+            np.ndarray or None: Row positions, closest first, or None if any
+            value is not on the grid
+        """
+        try:
+            index = tuple(
+                positions[float(value)]
+                for positions, value in zip(self._positions, choices)
+            )
+        except (KeyError, TypeError, ValueError):
+            return None
+        return self.table[index].astype(np.intp)
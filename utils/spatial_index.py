@@ -0,0 +1,178 @@
+"""
+KD-tree ranking backend for large catalogues.
+
+The recommendation is a nearest-neighbour query under the Chebyshev (L-inf)
+distance on the normalized criteria, which a KD-tree answers without visiting
+every phone. Building the tree and walking it only pays off above a certain
+catalogue size, so ``ranking_engine`` keeps the brute-force RankingEngine below
+a threshold measured once per process on random catalogues of growing size.
+"""
+
+import time
+
+import numpy as np
+
+from utils.ranking import RankingEngine, top_k_from_distances
+
+# Points per KD-tree leaf; leaves are scanned by brute force
+LEAF_SIZE = 40
+
+# Catalogue sizes timed to find where the tree overtakes brute force; below
+# the smallest one the tree is never used
+CALIBRATION_SIZES = (1_000, 4_000, 16_000, 64_000, 256_000)
+
+# (threshold, largest size timed) per number of criteria (see index_threshold)
+_thresholds = {}
+
+
+class IndexedRankingEngine(RankingEngine):
+    """
+    RankingEngine answering top-k queries with a Chebyshev KD-tree.
+
+    Results are identical to the brute-force engine, including ties, which are
+    broken by row position.
+
+    Args:
+        values: Array-like of shape (n_phones, n_criteria) with the raw criteria
+        directions: Optimization direction per criterion (see RankingEngine)
+        leaf_size: Points per tree leaf
+    """
+
+    def __init__(self, values, directions, leaf_size=LEAF_SIZE):
+        super().__init__(values, directions)
+        # Imported only when a catalogue is indexed, to keep the cold start fast
+        from sklearn.neighbors import KDTree
+
+        self.tree = KDTree(self.matrix, leaf_size=leaf_size, metric="chebyshev")
+
+    def top_k(self, aspirations, k):
+        """
+        Return the k phones closest to the aspiration vector.
+
+        Args:
+            aspirations: Array-like with one raw value per criterion
+            k: Number of phones to return (capped at the catalogue size)
+
+        Returns:
+            np.ndarray: Row positions of the k closest phones, closest first
+        """
+        return self.top_k_batch(aspirations, k)[0]
+
+    def top_k_batch(self, aspirations, k, max_bytes=None):
+        """
+        Return the k closest phones for each of many aspiration vectors.
+
+        Args:
+            aspirations: Array-like of shape (m, n_criteria) with raw values
+            k: Number of phones per row (capped at the catalogue size)
+            max_bytes: Unused; the tree builds no (m, n_phones) temporary
+
+        Returns:
+            np.ndarray: Row positions of shape (m, k), closest first
+        """
+        normalized = np.atleast_2d(self.normalize(aspirations))
+        m = normalized.shape[0]
+        n = len(self)
+        k = min(k, n)
+        if m == 0 or k == 0:
+            return np.empty((m, k), dtype=np.intp)
+
+        distance, winners = self.tree.query(normalized, k=k)
+        order = np.lexsort((winners, distance), axis=1)
+        result = np.take_along_axis(winners, order, axis=1).astype(np.intp)
+
+        if k < n:
+            # The tree picks arbitrarily between phones tied at the k-th
+            # distance; redo the rows with such ties from all the candidates
+            kth = distance[:, -1]
+            counts = self.tree.query_radius(normalized, kth, count_only=True)
+            for row in np.flatnonzero(counts > k):
+                candidates = np.sort(
+                    self.tree.query_radius(normalized[row : row + 1], kth[row])[0]
+                )
+                candidate_distance = np.abs(
+                    self.matrix[candidates] - normalized[row]
+                ).max(axis=1)
+                result[row] = candidates[top_k_from_distances(candidate_distance, k)]
+        return result
+
+
+def _query_time(engine, queries, k):
+    """Best time of answering all the queries one by one."""
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        for aspirations in queries:
+            engine.top_k(aspirations, k)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def index_threshold(
+    n_criteria, max_size=CALIBRATION_SIZES[-1], k=5, n_queries=20, seed=0
+):
+    """
+    Smallest catalogue size at which the KD-tree beats brute force.
+
+    Times both engines on uniformly random catalogues of CALIBRATION_SIZES up to
+    ``max_size``, stopping at the first size where the tree is faster. The
+    measurements are kept for the rest of the process.
+
+    Args:
+        n_criteria: Number of criteria
+        max_size: Largest catalogue size worth timing
+        k: Number of phones per query
+        n_queries: Queries timed per size
+        seed: Random seed
+
+    Returns:
+        float: Threshold in phones (infinity if the tree never won up to
+        ``max_size``)
+    """
+    threshold, measured = _thresholds.get(n_criteria, (float("inf"), 0))
+    if threshold == float("inf"):
+        rng = np.random.default_rng(seed)
+        directions = -np.ones(n_criteria)
+        queries = rng.random((n_queries, n_criteria))
+        for size in CALIBRATION_SIZES:
+            if size <= measured:
+                continue
+            if size > max_size:
+                break
+            values = rng.random((size, n_criteria))
+            brute = _query_time(RankingEngine(values, directions), queries, k)
+            tree = _query_time(IndexedRankingEngine(values, directions), queries, k)
+            measured = size
+            if tree < brute:
+                threshold = size
+                break
+        _thresholds[n_criteria] = (threshold, measured)
+    return threshold
+
+
+def ranking_engine(frame, fitness_columns, backend="auto", threshold=None):
+    """
+    Build the ranking engine of a catalogue.
+
+    Args:
+        frame: DataFrame containing the catalogue
+        fitness_columns: Ordered mapping of criterion column to direction
+        backend: "brute", "tree", or "auto" to use the tree from the threshold
+        threshold: Catalogue size from which "auto" uses the tree (None to
+            measure it with index_threshold)
+
+    Returns:
+        RankingEngine: Brute-force or indexed engine
+    """
+    if backend not in ("auto", "brute", "tree"):
+        raise ValueError(f"Unknown ranking backend: {backend}")
+    if backend == "auto":
+        n = len(frame)
+        if n < CALIBRATION_SIZES[0] and threshold is None:
+            backend = "brute"
+        else:
+            if threshold is None:
+                threshold = index_threshold(len(fitness_columns), max_size=n)
+            backend = "tree" if n >= threshold else "brute"
+    engine_class = IndexedRankingEngine if backend == "tree" else RankingEngine
+    return engine_class.from_frame(frame, fitness_columns)
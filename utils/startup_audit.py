@@ -0,0 +1,122 @@
+"""
+Startup time audit.
+
+Run the app with ``STARTUP_AUDIT=true`` to print how long each module imported
+by the app took to load, and how long each startup phase (catalogue loading,
+ranking structures, layouts, ...) took. Import times are cumulative: a module's
+time includes the modules it imports for the first time.
+
+This module only uses the standard library, so it can be imported before the
+heavy dependencies whose import time it measures.
+"""
+
+import builtins
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+
+class StartupAudit:
+    """
+    Timings of the imports and phases of the application startup.
+
+    Args:
+        enabled: Whether imports are timed and reports printed
+    """
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.started = time.perf_counter()
+        self.imports = {}
+        self.phases = {}
+        self._import = None
+        self._local = threading.local()
+
+    def track_imports(self):
+        """
+        Start timing the imports made from now on, by top-level import name.
+        """
+        if self._import is not None:
+            return
+        self._import = original = builtins.__import__
+
+        def timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+            # Only the outermost first-time import of a module is timed; the
+            # modules it pulls in are part of its time
+            depth = getattr(self._local, "depth", 0)
+            if depth or level or name in sys.modules:
+                return original(name, globals, locals, fromlist, level)
+            self._local.depth = 1
+            start = time.perf_counter()
+            try:
+                return original(name, globals, locals, fromlist, level)
+            finally:
+                self._local.depth = 0
+                self.imports[name] = time.perf_counter() - start
+
+        builtins.__import__ = timed_import
+
+    def stop_imports(self):
+        """
+        Stop timing imports.
+        """
+        if self._import is not None:
+            builtins.__import__ = self._import
+            self._import = None
+
+    @contextmanager
+    def phase(self, name):
+        """
+        Time a startup phase.
+
+        Args:
+            name: Phase name shown in the report
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + (
+                time.perf_counter() - start
+            )
+
+    def report(self, title="Startup"):
+        """
+        Format the timings recorded so far, slowest first.
+
+        Args:
+            title: First line of the report
+
+        Returns:
+            str: Report with one line per import and per phase
+        """
+        elapsed = time.perf_counter() - self.started
+        lines = [f"{title} audit: {elapsed * 1000:.1f} ms since audit start"]
+        for heading, timings in (("Imports", self.imports), ("Phases", self.phases)):
+            if not timings:
+                continue
+            lines.append(f"  {heading}:")
+            for name, seconds in sorted(
+                timings.items(), key=lambda item: item[1], reverse=True
+            ):
+                lines.append(f"    {seconds * 1000:9.1f} ms  {name}")
+        return "\n".join(lines)
+
+    def print_report(self, title="Startup"):
+        """
+        Print the report if the audit is enabled.
+
+        Args:
+            title: First line of the report
+        """
+        if self.enabled:
+            print(self.report(title), flush=True)
+
+
+startup_audit = StartupAudit(
+    enabled=os.environ.get("STARTUP_AUDIT", "False").lower() == "true"
+)
+if startup_audit.enabled:
+    startup_audit.track_imports()
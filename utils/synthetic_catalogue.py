@@ -0,0 +1,219 @@
+"""
+Synthetic phone catalogues of any size, for scale testing.
+
+The generator is fitted to the real catalogue (``Phones_2025.csv``) with a
+Gaussian copula: each numeric column keeps its own distribution (the empirical
+one, so RAM and storage stay on their real tiers), and the columns are drawn
+with the rank correlations of the real phones, so that e.g. phones with more
+RAM and storage also tend to cost more. Brand, release date and image id are
+copied from the real phone closest in price, and models are numbered.
+
+The output directory gets the phone CSV, a copy of the details file (same
+schema, so the app reads it unchanged) and the compiled binary catalogue::
+
+    python -m utils.synthetic_catalogue 100000 build/synthetic [--seed 0]
+
+Point the app at it with ``CATALOGUE_DATA``, ``CATALOGUE_DETAILS`` and
+``CATALOGUE_FILE`` (see main.py).
+"""
+
+import argparse
+import os
+import shutil
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+from utils.catalogue import (
+    DATA_FILE,
+    DETAILS_FILE,
+    catalogue_from_frames,
+    compile_catalogue,
+)
+
+# Numeric columns of the phone CSV and how sampled values are produced:
+# "tiers" only takes values seen in the real data, "continuous" interpolates
+# between them and rounds to the given number of decimals
+NUMERIC_COLUMNS = {
+    "RAM": ("tiers", 0),
+    "ROM": ("tiers", 0),
+    "battery": ("continuous", -1),
+    "camera": ("tiers", 0),
+    "screen": ("continuous", 2),
+    "rear_cameras": ("tiers", 0),
+    "average_cost": ("continuous", 0),
+}
+
+# Column whose value picks the real phone the text columns are copied from
+TEMPLATE_COLUMN = "average_cost"
+
+# Rows generated and written at a time
+CHUNK_SIZE = 1_000_000
+
+
+def _normal_scores(values):
+    """Map values to standard normal scores through their mid-ranks."""
+    ranks = pd.Series(values).rank(method="average").to_numpy()
+    return np.array([NormalDist().inv_cdf(p) for p in (ranks - 0.5) / len(values)])
+
+
+def _normal_cdf(x):
+    """
+    Standard normal distribution function, vectorized.
+
+    Uses the erf approximation 7.1.26 of Abramowitz and Stegun (absolute error
+    below 1.5e-7), which is plenty for sampling.
+    """
+    z = np.abs(x) / np.sqrt(2.0)
+    t = 1.0 / (1.0 + 0.3275911 * z)
+    poly = t * (
+        0.254829592
+        + t * (-0.284496736 + t * (1.421413741 + t * (-1.453152027 + t * 1.061405429)))
+    )
+    erf = 1.0 - poly * np.exp(-z * z)
+    return 0.5 * (1.0 + np.sign(x) * erf)
+
+
+class CatalogueModel:
+    """
+    Gaussian copula fitted to a phone catalogue.
+
+    Args:
+        frame: Real catalogue, with the columns of the phone CSV
+    """
+
+    def __init__(self, frame):
+        self.frame = frame.reset_index(drop=True)
+        self.columns = [col for col in NUMERIC_COLUMNS if col in frame]
+        scores = np.column_stack(
+            [_normal_scores(frame[col].to_numpy(float)) for col in self.columns]
+        )
+        correlation = np.corrcoef(scores, rowvar=False)
+        # Keep the matrix positive definite for sampling
+        eigenvalues, eigenvectors = np.linalg.eigh(correlation)
+        eigenvalues = np.clip(eigenvalues, 1e-6, None)
+        self.correlation = (eigenvectors * eigenvalues) @ eigenvectors.T
+        self.quantiles = {
+            col: np.sort(frame[col].to_numpy(float)) for col in self.columns
+        }
+        self.template_order = np.argsort(frame[TEMPLATE_COLUMN].to_numpy(float))
+
+    def _values(self, col, uniform):
+        """Inverse empirical distribution function of a column."""
+        quantiles = self.quantiles[col]
+        kind, decimals = NUMERIC_COLUMNS[col]
+        n = len(quantiles)
+        if kind == "tiers":
+            return quantiles[np.minimum((uniform * n).astype(int), n - 1)]
+        values = np.interp(uniform * (n - 1), np.arange(n), quantiles)
+        return np.round(values, decimals)
+
+    def sample(self, size, rng, start_id=1):
+        """
+        Draw synthetic phones.
+
+        Args:
+            size: Number of phones
+            rng: numpy.random.Generator
+            start_id: Number of the first synthetic model
+
+        Returns:
+            pd.DataFrame: Phones with the columns of the real catalogue
+        """
+        normal = rng.multivariate_normal(
+            np.zeros(len(self.columns)), self.correlation, size=size, method="cholesky"
+        )
+        uniform = _normal_cdf(normal)
+        sampled = {
+            col: self._values(col, uniform[:, i]) for i, col in enumerate(self.columns)
+        }
+
+        # Real phone at the same price quantile, for the text columns
+        position = uniform[:, self.columns.index(TEMPLATE_COLUMN)]
+        templates = self.template_order[
+            np.minimum((position * len(self.frame)).astype(int), len(self.frame) - 1)
+        ]
+        template_rows = self.frame.iloc[templates].reset_index(drop=True)
+
+        columns = {}
+        for col in self.frame.columns:
+            if col in sampled:
+                values = sampled[col]
+                if pd.api.types.is_integer_dtype(self.frame[col]):
+                    values = values.astype(self.frame[col].dtype)
+                columns[col] = values
+            else:
+                columns[col] = template_rows[col].to_numpy()
+        columns["model"] = [f"Synthetic {i}" for i in range(start_id, start_id + size)]
+        return pd.DataFrame(columns)
+
+
+def synthetic_catalogue(size, seed=0, data_path=DATA_FILE, details_path=DETAILS_FILE):
+    """
+    Generate a synthetic catalogue in memory.
+
+    Args:
+        size: Number of phones
+        seed: Random seed
+        data_path: Real phone CSV the generator is fitted to
+        details_path: Details file of the catalogue
+
+    Returns:
+        Catalogue: Synthetic catalogue, as loaded by the app
+    """
+    model = CatalogueModel(pd.read_csv(data_path, header=0))
+    data = model.sample(size, np.random.default_rng(seed))
+    details = pd.read_csv(details_path, header=0)
+    return catalogue_from_frames(data, details, source="synthetic")
+
+
+def write_synthetic_catalogue(
+    size,
+    output_dir,
+    seed=0,
+    data_path=DATA_FILE,
+    details_path=DETAILS_FILE,
+    chunk_size=CHUNK_SIZE,
+):
+    """
+    Generate a synthetic catalogue and write it as CSV and compiled files.
+
+    Args:
+        size: Number of phones
+        output_dir: Directory receiving the files (created if missing)
+        seed: Random seed
+        data_path: Real phone CSV the generator is fitted to
+        details_path: Details file copied next to the synthetic data
+        chunk_size: Phones generated and written at a time
+
+    Returns:
+        dict: Paths of the written "data", "details" and "compiled" files
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    paths = {
+        "data": os.path.join(output_dir, "Phones_synthetic.csv"),
+        "details": os.path.join(output_dir, os.path.basename(details_path)),
+        "compiled": os.path.join(output_dir, "catalogue.bin"),
+    }
+    model = CatalogueModel(pd.read_csv(data_path, header=0))
+    rng = np.random.default_rng(seed)
+    with open(paths["data"], "w", newline="") as f:
+        for start in range(0, size, chunk_size):
+            chunk = model.sample(min(chunk_size, size - start), rng, start + 1)
+            chunk.to_csv(f, header=start == 0, index=False)
+    shutil.copyfile(details_path, paths["details"])
+    compile_catalogue(paths["data"], paths["details"], paths["compiled"])
+    return paths
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic catalogue")
+    parser.add_argument("size", type=int, help="number of phones")
+    parser.add_argument(
+        "output_dir", nargs="?", default=os.path.join("build", "synthetic")
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    paths = write_synthetic_catalogue(args.size, args.output_dir, args.seed)
+    print(f"Wrote {args.size} phones to {paths['data']} and {paths['compiled']}")
@@ -0,0 +1,36 @@
+"""
+WSGI entry point for the production server.
+
+Gunicorn serves ``application`` with the settings in ``gunicorn.conf.py``::
+
+    gunicorn --config gunicorn.conf.py wsgi:application
+
+Running this module directly starts Gunicorn the same way::
+
+    python wsgi.py
+
+For local development, ``python main.py`` still starts the Dash debug server.
+"""
+
+import os
+import sys
+
+from main import server as application
+
+CONFIG_FILE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "gunicorn.conf.py"
+)
+
+
+def run():
+    """
+    Start Gunicorn with ``gunicorn.conf.py``.
+    """
+    from gunicorn.app.wsgiapp import run as gunicorn_run
+
+    sys.argv = ["gunicorn", "--config", CONFIG_FILE, "wsgi:application"]
+    gunicorn_run()
+
+
+if __name__ == "__main__":
+    run()